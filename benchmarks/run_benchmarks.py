@@ -0,0 +1,199 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from modules._player import Player
+from modules._game import Game
+from modules._random_stream import RandomStream
+from modules.tournament import Tournament
+from modules.strategies.strategies import *
+
+
+def get_strategies():
+    return [
+        GoodyTwoShoes(),
+        Cheater(),
+        Joker(threshold_to_cooperate=0.5),
+        CopyCat(start_with=None),
+        CopyKitten(defined_limit=2, start_with=1),
+        Businessman(random_actions=4, kindness_limit=0, copy_kitten_limit=2, copy_kitten_start_with=1),
+        Grudger(defined_limit=3),
+        Sequential(sequence=[1, 0, 0, 1, 1, 0]),
+        Alternator(alternate_after=2, start_with=1),
+        Pavlovian(start_with=1),
+        Forgiver(grudge_limit=2, copy_kitten_limit=2, copy_kitten_start_with=1),
+        GenerousCopyKat(forgiveness_prob=0.2),
+        SoftMajorityRule(start_with=1),
+    ]
+
+
+def measure(function, repeat):
+    """
+    Time a function and measure its peak memory.
+
+    Parameters:
+    function (callable): Called without arguments, creates everything it needs.
+    repeat (int): Number of timed calls, the fastest one is reported.
+
+    Returns:
+    dict: The best time in seconds and the peak memory in bytes.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    # Memory is measured in a separate call, tracing slows everything down
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'seconds': best, 'peak_memory_bytes': peak_memory}
+
+
+def benchmark_games(rounds_list, repeat):
+    results = []
+    strategies = get_strategies()
+    rng = RandomStream.from_seed(0)
+    for rounds in rounds_list:
+        for strategy_1 in strategies:
+            for strategy_2 in strategies:
+                def play():
+                    game = Game(player_1=Player(name='1', strategy=strategy_1, initial_score=0),
+                                player_2=Player(name='2', strategy=strategy_2, initial_score=0),
+                                name='benchmark', rounds=rounds, rng=rng)
+                    game.run(mistake_chance=0.05)
+
+                result = measure(play, repeat)
+                result.update(name=f'game {strategy_1.name} vs. {strategy_2.name}',
+                              rounds=rounds,
+                              rounds_per_second=rounds / result['seconds'])
+                results.append(result)
+    return results
+
+
+def create_tournament(copies, rounds, seed=0):
+    return Tournament(strategies=get_strategies(),
+                      copies_of_each_strategy=copies,
+                      rounds_per_game=rounds,
+                      games_between_players=2,
+                      initial_player_score=100,
+                      top_percentage=0.8,
+                      mistake_chance=0.05,
+                      survival_bias=0.1,
+                      seed=seed)
+
+
+def benchmark_tournaments(copies_list, rounds, backends, repeat):
+    results = []
+    for backend in backends:
+        for copies in copies_list:
+            def play():
+                create_tournament(copies, rounds).run(backend=backend)
+
+            tournament = create_tournament(copies, rounds)
+            games = sum(1 for _ in tournament.iterate_pairings())
+
+            result = measure(play, repeat)
+            result.update(name=f'tournament {backend}',
+                          players=len(tournament.players),
+                          games=games,
+                          rounds=rounds,
+                          rounds_per_second=games * rounds / result['seconds'])
+            results.append(result)
+    return results
+
+
+def benchmark_multiply_top_players(copies_list, repeat):
+    results = []
+    for copies in copies_list:
+        # Scores from a real (short) tournament, so the players aren't all tied
+        played = create_tournament(copies, rounds=10)
+        played.run(backend='vectorized')
+        scores = [player.score for player in played.players]
+
+        def multiply():
+            tournament = create_tournament(copies, rounds=10)
+            for player, score in zip(tournament.players, scores):
+                player.score = score
+            tournament.multiply_top_players()
+
+        result = measure(multiply, repeat)
+        result.update(name='multiply_top_players', players=len(played.players))
+        results.append(result)
+    return results
+
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous_path):
+    """Print the speed of every benchmark relative to a previous run"""
+    with open(previous_path) as file:
+        previous = json.load(file)
+
+    def key(result):
+        return result['name'], result.get('rounds'), result.get('players')
+
+    previous_seconds = {key(result): result['seconds'] for result in previous['results']}
+    for result in results:
+        before = previous_seconds.get(key(result))
+        if before:
+            print(f'{result["name"]:<50}{before / result["seconds"]:>8.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark games, tournaments and multiply_top_players')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file for the results')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare with')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed calls per benchmark (the best is kept)')
+    parser.add_argument('--quick', action='store_true', help='Smaller sizes, for a fast sanity check')
+    parser.add_argument('--process', action='store_true', help='Also benchmark the process backend')
+    arguments = parser.parse_args()
+
+    if arguments.quick:
+        rounds_list, copies_list, tournament_rounds = [10, 100], [1, 2], 20
+    else:
+        rounds_list, copies_list, tournament_rounds = [10, 100, 1000], [1, 2, 4, 8], 100
+
+    backends = ['serial', 'vectorized'] + (['process'] if arguments.process else [])
+
+    results = []
+    results += benchmark_games(rounds_list, arguments.repeat)
+    results += benchmark_tournaments(copies_list, tournament_rounds, backends, arguments.repeat)
+    results += benchmark_multiply_top_players(copies_list, arguments.repeat)
+
+    output = {
+        'commit': get_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+    with open(arguments.output, 'w') as file:
+        json.dump(output, file, indent=2)
+
+    for result in results:
+        size = result.get('players', result.get('rounds'))
+        if 'rounds_per_second' in result:
+            print(f'{result["name"]:<50}{size:>6}{result["rounds_per_second"]:>14,.0f} rounds/s')
+        else:
+            print(f'{result["name"]:<50}{size:>6}{result["seconds"]:>14.4f} s')
+
+    if arguments.compare:
+        compare(results, arguments.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+from abc import abstractmethod
+import asyncio
+import inspect
+import time
+from modules._game import Game
+from modules._player import Player
+from modules._metrics import Metrics
+from modules._payoff import Payoff
+from modules._random_stream import RandomStream
+from modules._strategy import Strategy
+from modules._trace import TraceWriter
+
+
+class Forfeit(Exception):
+    """Raised by an asynchronous strategy that can't decide (e.g. its process died),
+    so it plays the timeout action instead, like a strategy that didn't decide in time"""
+    pass
+
+
+def is_async(strategy: Strategy):
+    """Whether the strategy decides asynchronously (its get_recommended_action is a coroutine)"""
+    return inspect.iscoroutinefunction(strategy.get_recommended_action)
+
+
+class AsyncStrategy(Strategy):
+    """A strategy that decides asynchronously, e.g. by asking another process.
+
+    Subclasses implement the coroutine get_recommended_action instead of get_action.
+    Such strategies can only be played by AsyncGame (the 'async' backend of Tournament)."""
+
+    def get_action(self, self_moves, opponent_moves, memory):
+        raise TypeError(f'{self} decides asynchronously, play it with the async backend')
+
+    @abstractmethod
+    async def get_recommended_action(self, self_moves, opponent_moves, memory):
+        """
+        Get the recommended action and its explanation.
+
+        Parameters:
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
+
+        Returns:
+        tuple: (action, explanation) where action is the recommended action (0 or 1)
+               and explanation is a string explaining the decision.
+        """
+        pass
+
+    async def start(self):
+        """Prepare the strategy (e.g. start its process), called before a tournament's games"""
+        pass
+
+    async def close(self):
+        """Release what the strategy holds (e.g. its process), called when a tournament's games are over"""
+        pass
+
+
+class DelayedStrategy(AsyncStrategy):
+    """Another strategy, answering after a delay.
+    A stand-in for a remote strategy, e.g. to try timeouts and concurrency limits"""
+
+    def __init__(self, strategy: Strategy, delay: float):
+        """
+        Initialize the strategy.
+
+        Parameters:
+        strategy (Strategy): The strategy that decides.
+        delay (float): Seconds to wait before every decision.
+
+        Returns:
+        None
+        """
+        self.strategy = strategy
+        self.delay = delay
+        self.memory_class = strategy.memory_class
+        super().__init__(strategy.name)
+
+    def __repr__(self):
+        return f'{self.strategy} [delay {self.delay}]'
+
+    @property
+    def deterministic(self):
+        return self.strategy.deterministic
+
+    def new_memory(self, rng: RandomStream = None):
+        return self.strategy.new_memory(rng)
+
+    def observe(self, memory, my_action, opponent_action):
+        self.strategy.observe(memory, my_action, opponent_action)
+
+    async def get_recommended_action(self, self_moves, opponent_moves, memory):
+        await asyncio.sleep(self.delay)
+        return self.strategy.get_recommended_action(self_moves, opponent_moves, memory)
+
+
+class SubprocessStrategy(AsyncStrategy):
+    """A strategy played by other processes, e.g. a bot submitted to a competition, in any language.
+
+    For every decision, a process gets a line of the player's moves and the opponent's moves,
+    as strings of 0 and 1 separated by a space (both empty in the first round), and answers with
+    a line of 0 or 1. Every decision has the whole history, so the processes don't need to keep anything,
+    and a process whose decision timed out, that exited or that answered anything else is simply replaced
+    by a new one (and forfeits the decision).
+    The processes are started before the games, so starting them doesn't count in the decisions' time."""
+
+    thoughts = {None: "I asked my process"}
+
+    def __init__(self, name: str, command, processes: int = 1):
+        """
+        Initialize the strategy.
+
+        Parameters:
+        name (str): Name of the strategy.
+        command (list): The program and its arguments, e.g. ['python', 'bot.py'].
+        processes (int): Number of processes, deciding at once for different games.
+
+        Returns:
+        None
+        """
+        self.command = list(command)
+        self.processes = processes
+        self.idle = None  # The processes that aren't deciding (None for one to start), created in the games' loop
+        super().__init__(name)
+
+    def __repr__(self):
+        return f'{self.name} [{" ".join(self.command)}]'
+
+    async def start_process(self):
+        return await asyncio.create_subprocess_exec(*self.command,
+                                                    stdin=asyncio.subprocess.PIPE,
+                                                    stdout=asyncio.subprocess.PIPE)
+
+    async def start(self):
+        self.idle = asyncio.Queue()
+        for _ in range(self.processes):
+            self.idle.put_nowait(await self.start_process())
+
+    async def replace_process(self, idle: asyncio.Queue, process):
+        """Kill a process that can't be asked again and return a new one to the idle processes"""
+        if process is not None and process.returncode is None:
+            if process.stdout.at_eof():
+                # It is exiting, killing it now would race with collecting its exit status
+                try:
+                    await asyncio.wait_for(process.wait(), 1)
+                except asyncio.TimeoutError:
+                    pass
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+        # The strategy was closed (or restarted) meanwhile, so the processes are not its anymore
+        if idle is not self.idle:
+            return
+
+        try:
+            replacement = await self.start_process()
+        except OSError:
+            replacement = None  # Started again by the next decision
+        if idle is self.idle:
+            idle.put_nowait(replacement)
+        elif replacement is not None:
+            await self.replace_process(idle, replacement)
+
+    async def get_recommended_action(self, self_moves, opponent_moves, memory):
+        if self.idle is None:
+            await self.start()
+        idle = self.idle
+
+        # Every move is a 0 or 1 byte, so its hex is 00 or 01
+        request = f'{self_moves.tobytes().hex()[1::2]} {opponent_moves.tobytes().hex()[1::2]}\n'
+
+        process = await idle.get()
+        try:
+            if process is None:
+                process = await self.start_process()
+            process.stdin.write(request.encode())
+            await process.stdin.drain()
+            answer = await process.stdout.readline()
+            if answer.strip() not in (b'0', b'1'):
+                # An empty answer is the end of the output, the process exited
+                raise Forfeit(f'{self} answered {answer!r} instead of 0 or 1')
+        except OSError as error:
+            # E.g. writing to a process that exited
+            await self.replace_process(idle, process)
+            raise Forfeit(f'{self} failed: {error}') from error
+        except BaseException:
+            # The process may still answer (e.g. after a timeout), so it is replaced
+            await self.replace_process(idle, process)
+            raise
+        idle.put_nowait(process)
+
+        return int(answer), self.explain(memory)
+
+    async def close(self):
+        if self.idle is None:
+            return
+        idle = self.idle
+        self.idle = None
+        while not idle.empty():
+            process = idle.get_nowait()
+            if process is None or process.returncode is not None:
+                continue
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), 1)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+
+
+class AsyncGame(Game):
+    """A game whose strategies may decide asynchronously.
+
+    Many games are interleaved by the event loop while they wait for their strategies.
+    When both strategies are asynchronous they are asked at the same time.
+    A traced game writes its events when it ends, so the events of concurrent games aren't mixed."""
+
+    def __init__(self, player_1: Player, player_2: Player,
+                 name: str, rounds: int, rng: RandomStream = None, payoff: Payoff = None,
+                 metrics: Metrics = None, trace: TraceWriter = None,
+                 move_timeout: float = None, timeout_action: int = 0):
+        """
+        Initialize the game.
+
+        Parameters:
+        move_timeout (float): Seconds an asynchronous strategy has for a decision, None for no limit.
+        timeout_action (int): The action of a strategy that didn't decide in time or forfeited (cheating by default).
+        Other parameters are the same as Game's.
+
+        Returns:
+        None
+        """
+        # Asynchronous strategies can't be played by kernels, and their games aren't skipped
+        super().__init__(player_1=player_1, player_2=player_2, name=name, rounds=rounds, rng=rng, payoff=payoff,
+                         metrics=metrics, detect_cycles=False, use_kernels=False, trace=trace)
+        self.move_timeout = move_timeout
+        self.timeout_action = timeout_action
+        # Synchronous decisions are only timed in a few rounds (see Metrics.get_sampled_rounds)
+        self.sampled_rounds = metrics.get_sampled_rounds(rounds) if metrics is not None else {}
+
+    async def get_async_action(self, player: Player, self_moves, opponent_moves, memory):
+        """The action and thoughts of a player with an asynchronous strategy"""
+        strategy = player.strategy
+        start = time.perf_counter()
+        try:
+            action, thoughts = await asyncio.wait_for(
+                strategy.get_recommended_action(self_moves, opponent_moves, memory), self.move_timeout)
+        except asyncio.TimeoutError:
+            action, thoughts = self.timeout_action, "I didn't decide in time"
+            if self.metrics is not None:
+                self.metrics.record_timeout(strategy)
+        except Forfeit as forfeit:
+            action, thoughts = self.timeout_action, f'I forfeited: {forfeit}'
+            if self.metrics is not None:
+                self.metrics.record_forfeit(strategy)
+
+        # Asynchronous decisions are slow enough to always time
+        if self.metrics is not None:
+            self.metrics.record_decision(strategy, time.perf_counter() - start)
+        if player.keep_moves:
+            player.moves.append(action)
+        return action, thoughts
+
+    def get_action(self, player: Player, self_moves, opponent_moves, memory, round_number: int, explain: bool):
+        """The action and thoughts (None unless explained) of a player with a synchronous strategy"""
+        if explain:
+            return player.get_action_and_thoughts(self_moves, opponent_moves, memory)
+        weight = self.sampled_rounds.get(round_number)
+        if weight is not None:
+            return self.get_timed_action(player, self_moves, opponent_moves, memory, weight), None
+        return player.get_action(self_moves, opponent_moves, memory), None
+
+    async def run(self, mistake_chance: float = .0):
+        """Play all the rounds, and return the total score change of each player in this game"""
+        start_time = time.perf_counter()
+
+        strategy_1 = self.player_1.strategy
+        strategy_2 = self.player_2.strategy
+        async_1 = is_async(strategy_1)
+        async_2 = is_async(strategy_2)
+
+        view_1 = memoryview(self.moves_1).toreadonly()
+        view_2 = memoryview(self.moves_2).toreadonly()
+
+        flips_1, flips_2 = self.rng.mistakes(self.rounds, mistake_chance)
+
+        # The events of a traced game, written when it ends
+        explain = self.trace is not None
+        game_event = self.get_game_event() if explain else None
+        events = [game_event] if explain else None
+
+        for round_number in range(self.rounds):
+            self.round_number = round_number
+            moves_1 = view_1[:round_number]
+            moves_2 = view_2[:round_number]
+
+            if async_1 and async_2:
+                (action_1, thoughts_1), (action_2, thoughts_2) = await asyncio.gather(
+                    self.get_async_action(self.player_1, moves_1, moves_2, self.memory_1),
+                    self.get_async_action(self.player_2, moves_2, moves_1, self.memory_2))
+            else:
+                # The first player always decides first, so synchronous strategies draw random numbers in order
+                if async_1:
+                    action_1, thoughts_1 = await self.get_async_action(self.player_1, moves_1, moves_2, self.memory_1)
+                else:
+                    action_1, thoughts_1 = self.get_action(self.player_1, moves_1, moves_2, self.memory_1,
+                                                           round_number, explain)
+                if async_2:
+                    action_2, thoughts_2 = await self.get_async_action(self.player_2, moves_2, moves_1, self.memory_2)
+                else:
+                    action_2, thoughts_2 = self.get_action(self.player_2, moves_2, moves_1, self.memory_2,
+                                                           round_number, explain)
+
+            flip_1 = flips_1[round_number]
+            flip_2 = flips_2[round_number]
+
+            action_1_final = self.flip(action_1) if flip_1 else action_1
+            action_2_final = self.flip(action_2) if flip_2 else action_2
+
+            self.moves_1[round_number] = action_1_final
+            self.moves_2[round_number] = action_2_final
+
+            strategy_1.observe(self.memory_1, action_1_final, action_2_final)
+            strategy_2.observe(self.memory_2, action_2_final, action_1_final)
+
+            if explain:
+                # The scores are only followed round by round when they are traced
+                score_1, score_2 = self.payoff.get_round_scores(action_1_final, action_2_final)
+                self.player_1.update_score(score_1, 0)
+                self.player_2.update_score(score_2, 0)
+
+                events.append({'event': 'round', 'game': self.name, 'round': round_number,
+                               'action_1': action_1, 'final_1': action_1_final, 'flip_1': bool(flip_1),
+                               'action_2': action_2, 'final_2': action_2_final, 'flip_2': bool(flip_2),
+                               'thoughts_1': thoughts_1, 'thoughts_2': thoughts_2,
+                               'score_1': self.player_1.score, 'score_2': self.player_2.score})
+
+        game_score_1, game_score_2 = self.payoff.get_game_scores(self.moves_1, self.moves_2)
+        if explain:
+            for event in events:
+                self.trace.write(event)
+        else:
+            self.player_1.update_score(game_score_1, 0)
+            self.player_2.update_score(game_score_2, 0)
+
+        if self.metrics is not None:
+            self.metrics.record_games(1, self.rounds, time.perf_counter() - start_time)
+
+        return game_score_1, game_score_2
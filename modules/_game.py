@@ -1,18 +1,38 @@
 from abc import abstractmethod
-from _player import Player
+from array import array
+import time
+from modules._player import Player
+from modules._metrics import Metrics
+from modules._random_stream import RandomStream, default_stream
+from modules._payoff import Payoff, default_payoff
+from modules._trace import TraceWriter, render_round
+from modules._kernels import get_kernel
 from modules.strategies.strategies import *
 
 
 class Game:
     def __init__(self, player_1: Player, player_2: Player,
-                 name: str, rounds: int, debug: bool = False):
+                 name: str, rounds: int, rng: RandomStream = None, payoff: Payoff = None,
+                 metrics: Metrics = None, detect_cycles: bool = True, use_kernels: bool = True,
+                 debug: bool = False, trace: TraceWriter = None):
         self.player_1 = player_1
         self.player_2 = player_2
         self.name = name
         self.rounds = rounds
-        self.moves_1 = []
-        self.moves_2 = []
+        # One byte per round, preallocated for the whole game
+        self.moves_1 = array('b', bytes(rounds))
+        self.moves_2 = array('b', bytes(rounds))
+        # Mistakes and random strategies draw from the game's stream, not from the global random
+        self.rng = rng if rng is not None else default_stream
+        self.payoff = payoff if payoff is not None else default_payoff
+        self.memory_1 = player_1.strategy.new_memory(self.rng)
+        self.memory_2 = player_2.strategy.new_memory(self.rng)
+        self.metrics = metrics
+        self.detect_cycles = detect_cycles
+        self.use_kernels = use_kernels
         self.debug = debug
+        # Only the games the trace's filters want are traced
+        self.trace = trace if trace is not None and trace.wants(self) else None
         self.round_number = 1
 
     def my_print(self, obj):
@@ -23,96 +43,167 @@ class Game:
     def flip(action_value):
         return 0 if action_value == 1 else 1
 
-    def run(self, mistake_chance: float = .0):
-        for round_number in range(self.rounds):
-            self.round_number = round_number
-
-            action_1, thoughts_1 = self.player_1.get_action_and_thoughts(self.moves_1, self.moves_2)
-            action_2, thoughts_2 = self.player_2.get_action_and_thoughts(self.moves_2, self.moves_1)
-
-            flip_1 = random.random() < mistake_chance
-            flip_2 = random.random() < mistake_chance
-
-            action_1_final = self.flip(action_1) if flip_1 else action_1
-            action_2_final = self.flip(action_2) if flip_2 else action_2
-
-            if self.debug:
-                print_action_1_final = f'->{action_1_final}' if flip_1 else '\t'
-                print_action_2_final = f'->{action_2_final}' if flip_2 else '\t'
-
-                left_part = f'{self.player_1.strategy.name} {action_1}{print_action_1_final}'
-
-                paragraph_width = 25
-
-                left_part = self.bring_to_length(left_part, paragraph_width)
-
-                print_actions = f'\nRound {str(round_number + 1).zfill(2)}\t\t' +\
-                                left_part +\
-                                f'\t{self.player_2.strategy.name} {action_2}{print_action_2_final}\n'
-
-                self.my_print(print_actions)
-
-                self.print_two_paragraphs(thoughts_1, thoughts_2, paragraph_width)
+    def get_timed_action(self, player: Player, self_moves, opponent_moves, memory, weight: int):
+        start = time.perf_counter()
+        action = player.get_action(self_moves, opponent_moves, memory)
+        self.metrics.record_decision(player.strategy, time.perf_counter() - start, weight)
+        return action
+
+    def get_game_event(self):
+        return {'event': 'game', 'game': self.name,
+                'player_1': self.player_1.name, 'player_2': self.player_2.name,
+                'strategy_1': self.player_1.strategy.name, 'strategy_2': self.player_2.strategy.name,
+                'rounds': self.rounds}
+
+    def can_skip_cycles(self, mistake_chance: float):
+        """Whether the game can only end one way, and both strategies can tell when they repeat"""
+        strategy_1 = self.player_1.strategy
+        strategy_2 = self.player_2.strategy
+        return self.detect_cycles and mistake_chance == 0 and not self.debug and self.trace is None and \
+            strategy_1.deterministic and strategy_2.deterministic and \
+            strategy_1.get_state_key(self.memory_1) is not None and \
+            strategy_2.get_state_key(self.memory_2) is not None
+
+    def skip_cycle(self, cycle_start: int, round_number: int):
+        """
+        Play the remaining rounds by repeating the cycle, without asking the strategies.
+
+        Parameters:
+        cycle_start (int): The round the joint state was first seen in.
+        round_number (int): The round the joint state repeated in.
+
+        Returns:
+        None
+        """
+        # The moves of the remaining rounds are the cycle's moves, again and again.
+        # Everything since the cycle started is whole cycles, so it is copied at once (doubling every time)
+        position = round_number
+        while position < self.rounds:
+            length = min(position - cycle_start, self.rounds - position)
+            self.moves_1[position:position + length] = self.moves_1[cycle_start:cycle_start + length]
+            self.moves_2[position:position + length] = self.moves_2[cycle_start:cycle_start + length]
+            position += length
+
+    def keep_moves(self, first_round: int, flips_1, flips_2):
+        """Add the actions of the rounds from first_round on, which the players weren't asked for
+        (cycles and kernels), to the moves of the players that keep them"""
+        for player, moves, flips in ((self.player_1, self.moves_1, flips_1), (self.player_2, self.moves_2, flips_2)):
+            if player.keep_moves:
+                # The players keep their actions before mistakes
+                player.moves.extend(move ^ flip for move, flip in zip(moves[first_round:], flips[first_round:]))
 
-            self.moves_1.append(action_1_final)
-            self.moves_2.append(action_2_final)
-
-            add_1, sub_1, add_2, sub_2 = self.calculate_gains_losses(action_1_final,
-                                                                     action_2_final)
-
-            self.player_1.update_score(add_1, sub_1)
-            self.player_2.update_score(add_2, sub_2)
-
-            tabs = '\t' * 8
-            print_scores = f'\t\t\t\t{self.player_1.score}{tabs}{self.player_2.score}'
-            self.my_print('\n' + print_scores)
-
-    @staticmethod
-    def bring_to_length(string, min_allowed_length):
-        spaces = ''
-        if len(string) < min_allowed_length:
-            spaces = ' ' * (min_allowed_length - len(string))
-        return string + spaces
-
-    @staticmethod
-    def calculate_gains_losses(action_1: int, action_2: int):
-        add_1 = 3 if action_2 else 0
-        add_2 = 3 if action_1 else 0
-        sub_1 = -1 if action_1 else 0
-        sub_2 = -1 if action_2 else 0
-
-        return add_1, sub_1, add_2, sub_2
-
-    @staticmethod
-    def print_two_paragraphs(sentence_1, sentence_2, paragraph_width):
-        def split_string_by_length(input_string, n):
-            return [input_string[j:j + n] for j in range(0, len(input_string), n)]
+    def run(self, mistake_chance: float = .0):
+        """Play all the rounds, and return the total score change of each player in this game"""
+        metrics = self.metrics
+        start_time = time.perf_counter()
 
-        res1 = split_string_by_length(sentence_1, paragraph_width)
-        res2 = split_string_by_length(sentence_2, paragraph_width)
+        # Strategies get read-only views of the moves played so far
+        view_1 = memoryview(self.moves_1).toreadonly()
+        view_2 = memoryview(self.moves_2).toreadonly()
 
-        left_tabs = '\t' * 4
-        middle_tabs = '\t' * 2
+        # All the mistakes of the game are drawn at once
+        flips_1, flips_2 = self.rng.mistakes(self.rounds, mistake_chance)
 
-        lines = []
+        # Without mistakes, the game repeats itself once the joint state of the strategies does
+        states = {} if self.can_skip_cycles(mistake_chance) else None
 
-        for i in range(max([len(res1), len(res2)])):
-            left_text = res1[i] if i < len(res1) else ''
-            left_text_length = len(left_text)
+        # Debugging prints the same events that tracing writes
+        explain = self.debug or self.trace is not None
 
-            left_padding = paragraph_width - left_text_length
-            left_spaces = ' ' * left_padding
+        # Pairs of simple built-in strategies are played by a kernel, unless the game repeats itself anyway
+        kernel = get_kernel(self.player_1.strategy, self.player_2.strategy) \
+            if self.use_kernels and states is None and not explain else None
+        if kernel is not None:
+            return self.run_kernel(kernel, flips_1, flips_2, start_time)
 
-            left_part = left_text + left_spaces
+        # Decisions are only timed in a few rounds (see Metrics.get_sampled_rounds)
+        sampled_rounds = metrics.get_sampled_rounds(self.rounds) if metrics is not None else {}
 
-            right_text = res2[i] if i < len(res2) else ''
+        game_event = self.get_game_event() if explain else None
+        if self.trace is not None:
+            self.trace.write(game_event)
 
-            new_line = left_tabs + left_part + middle_tabs + right_text
+        for round_number in range(self.rounds):
+            self.round_number = round_number
 
-            lines.append(new_line)
+            if states is not None:
+                state = (self.player_1.strategy.get_state_key(self.memory_1),
+                         self.player_2.strategy.get_state_key(self.memory_2))
+
+                cycle_start = states.setdefault(state, round_number)
+                if cycle_start != round_number:
+                    self.skip_cycle(cycle_start, round_number)
+                    self.keep_moves(round_number, flips_1, flips_2)
+                    break
+
+            moves_1 = view_1[:round_number]
+            moves_2 = view_2[:round_number]
+
+            if explain:
+                action_1, thoughts_1 = self.player_1.get_action_and_thoughts(moves_1, moves_2, self.memory_1)
+                action_2, thoughts_2 = self.player_2.get_action_and_thoughts(moves_2, moves_1, self.memory_2)
+            elif round_number in sampled_rounds:
+                weight = sampled_rounds[round_number]
+                action_1 = self.get_timed_action(self.player_1, moves_1, moves_2, self.memory_1, weight)
+                action_2 = self.get_timed_action(self.player_2, moves_2, moves_1, self.memory_2, weight)
+            else:
+                # Thoughts are only explained when debugging or tracing
+                action_1 = self.player_1.get_action(moves_1, moves_2, self.memory_1)
+                action_2 = self.player_2.get_action(moves_2, moves_1, self.memory_2)
+
+            flip_1 = flips_1[round_number]
+            flip_2 = flips_2[round_number]
 
-        print('\n'.join(lines))
+            action_1_final = self.flip(action_1) if flip_1 else action_1
+            action_2_final = self.flip(action_2) if flip_2 else action_2
 
+            self.moves_1[round_number] = action_1_final
+            self.moves_2[round_number] = action_2_final
+
+            self.player_1.strategy.observe(self.memory_1, action_1_final, action_2_final)
+            self.player_2.strategy.observe(self.memory_2, action_2_final, action_1_final)
+
+            if explain:
+                # The scores are only followed round by round when they are shown
+                score_1, score_2 = self.payoff.get_round_scores(action_1_final, action_2_final)
+                self.player_1.update_score(score_1, 0)
+                self.player_2.update_score(score_2, 0)
+
+                round_event = {'event': 'round', 'game': self.name, 'round': round_number,
+                               'action_1': action_1, 'final_1': action_1_final, 'flip_1': bool(flip_1),
+                               'action_2': action_2, 'final_2': action_2_final, 'flip_2': bool(flip_2),
+                               'thoughts_1': thoughts_1, 'thoughts_2': thoughts_2,
+                               'score_1': self.player_1.score, 'score_2': self.player_2.score}
+                if self.trace is not None:
+                    self.trace.write(round_event)
+                if self.debug:
+                    print(render_round(game_event, round_event))
+
+        # All the moves are played (or repeated), so the scores are counted from them at once
+        game_score_1, game_score_2 = self.payoff.get_game_scores(self.moves_1, self.moves_2)
+        if not explain:
+            self.player_1.update_score(game_score_1, 0)
+            self.player_2.update_score(game_score_2, 0)
+
+        if metrics is not None:
+            metrics.record_games(1, self.rounds, time.perf_counter() - start_time)
+
+        return game_score_1, game_score_2
+
+    def run_kernel(self, kernel, flips_1, flips_2, start_time: float):
+        """Play all the rounds with a kernel (see modules._kernels), the memories are not updated"""
+        kernel(self, flips_1, flips_2)
+        self.round_number = self.rounds - 1
+        self.keep_moves(0, flips_1, flips_2)
+
+        game_score_1, game_score_2 = self.payoff.get_game_scores(self.moves_1, self.moves_2)
+        self.player_1.update_score(game_score_1, 0)
+        self.player_2.update_score(game_score_2, 0)
+
+        if self.metrics is not None:
+            self.metrics.record_games(1, self.rounds, time.perf_counter() - start_time)
+
+        return game_score_1, game_score_2
 
 if __name__ == '__main__':
     debug = True
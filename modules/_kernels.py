@@ -0,0 +1,153 @@
+from modules.strategies.strategies import GoodyTwoShoes, Cheater, CopyCat, Pavlovian, GenerousCopyKat
+
+
+class Reaction:
+    """How a simple strategy decides, as data a kernel can play without calling the strategy.
+
+    The first action is start (or a coin when start is None), and every other action is
+    table[2 * my last action + opponent's last action], or cooperation when a draw of the
+    game's stream is below forgiveness (no draw at all when forgiveness is None)."""
+
+    __slots__ = ('start', 'table', 'forgiveness')
+
+    def __init__(self, start, table, forgiveness=None):
+        self.start = start
+        self.table = table
+        self.forgiveness = forgiveness
+
+
+def get_pavlovian_table():
+    # Continue when we did the same, change otherwise
+    return tuple(my_last if my_last == opponent_last else 1 - my_last
+                 for my_last in (0, 1) for opponent_last in (0, 1))
+
+
+# The reactions of the built-in strategies with a kernel. Only these exact classes
+# are played by kernels, subclasses may change anything so they get the generic loop
+REACTIONS = {
+    GoodyTwoShoes: lambda strategy: Reaction(1, (1, 1, 1, 1)),
+    Cheater: lambda strategy: Reaction(0, (0, 0, 0, 0)),
+    CopyCat: lambda strategy: Reaction(strategy.start_with, (0, 1, 0, 1)),
+    Pavlovian: lambda strategy: Reaction(strategy.start_with, get_pavlovian_table()),
+    GenerousCopyKat: lambda strategy: Reaction(1, (0, 1, 0, 1), strategy.forgiveness_prob),
+}
+
+
+def get_reaction(strategy):
+    """The strategy's Reaction, or None when it has no kernel"""
+    get = REACTIONS.get(type(strategy))
+    return get(strategy) if get is not None else None
+
+
+def get_kernel(strategy_1, strategy_2):
+    """The kernel playing a game between the strategies, or None when one of them has no kernel"""
+    reaction_1 = get_reaction(strategy_1)
+    reaction_2 = get_reaction(strategy_2) if reaction_1 is not None else None
+    if reaction_2 is None:
+        return None
+    return lambda game, flips_1, flips_2: play_reactions(game, reaction_1, reaction_2, flips_1, flips_2)
+
+
+def play_reactions(game, reaction_1: Reaction, reaction_2: Reaction, flips_1, flips_2):
+    """
+    Play all the rounds of a game between two reactions, in a single tight loop.
+
+    The game's stream is drawn in the same order as the strategies draw it in Game.run
+    (the first player before the second in every round), so the moves and scores are the same.
+
+    Parameters:
+    game (Game): The game, its moves are filled in.
+    reaction_1 (Reaction): The reaction of the first player.
+    reaction_2 (Reaction): The reaction of the second player.
+    flips_1 (list): Mistakes of the first player, a bool per round.
+    flips_2 (list): Mistakes of the second player, a bool per round.
+
+    Returns:
+    None
+    """
+    rng = game.rng
+    moves_1 = game.moves_1
+    moves_2 = game.moves_2
+
+    table_1 = reaction_1.table
+    table_2 = reaction_2.table
+    forgiveness_1 = reaction_1.forgiveness
+    forgiveness_2 = reaction_2.forgiveness
+
+    action_1 = reaction_1.start if reaction_1.start is not None else rng.coin()
+    action_2 = reaction_2.start if reaction_2.start is not None else rng.coin()
+
+    for round_number in range(game.rounds):
+        if round_number:
+            action_1, action_2 = table_1[2 * action_1 + action_2], table_2[2 * action_2 + action_1]
+
+            if forgiveness_1 is not None and rng.random() < forgiveness_1:
+                action_1 = 1
+            if forgiveness_2 is not None and rng.random() < forgiveness_2:
+                action_2 = 1
+
+        if flips_1[round_number]:
+            action_1 = 1 - action_1
+        if flips_2[round_number]:
+            action_2 = 1 - action_2
+
+        moves_1[round_number] = action_1
+        moves_2[round_number] = action_2
+
+
+def verify(rounds: int = 200, mistake_chances=(0, 0.05, 0.5), seeds=range(5)):
+    """
+    Check that every pair of kernel strategies plays exactly as in the generic loop of Game.run.
+
+    Returns:
+    list: The (strategy_1, strategy_2, mistake_chance, seed) of the games that differ, empty when all match.
+    """
+    from modules._game import Game
+    from modules._player import Player
+    from modules._random_stream import RandomStream
+
+    kernel_strategies = [GoodyTwoShoes(), Cheater(), CopyCat(start_with=1), CopyCat(start_with=None),
+                         Pavlovian(start_with=0), Pavlovian(start_with=None),
+                         GenerousCopyKat(forgiveness_prob=0.2), GenerousCopyKat(forgiveness_prob=0.0)]
+
+    def play(strategy_1, strategy_2, mistake_chance, seed, use_kernels):
+        # The stream is shared by all the games, so it's checked after a few games in a row
+        stream = RandomStream.from_seed(seed)
+        results = []
+        for _ in range(3):
+            game = Game(player_1=Player(name='1', strategy=strategy_1, initial_score=0),
+                        player_2=Player(name='2', strategy=strategy_2, initial_score=0),
+                        name='verify', rounds=rounds, rng=stream, use_kernels=use_kernels)
+            scores = game.run(mistake_chance=mistake_chance)
+            results.append((scores, game.player_1.score, game.player_2.score,
+                            game.moves_1.tobytes(), game.moves_2.tobytes()))
+        return results, stream.random()
+
+    differences = []
+    for strategy_1 in kernel_strategies:
+        for strategy_2 in kernel_strategies:
+            for mistake_chance in mistake_chances:
+                for seed in seeds:
+                    if play(strategy_1, strategy_2, mistake_chance, seed, True) != \
+                            play(strategy_1, strategy_2, mistake_chance, seed, False):
+                        differences.append((strategy_1, strategy_2, mistake_chance, seed))
+    return differences
+
+
+if __name__ == '__main__':
+    import time
+    from modules._game import Game
+    from modules._player import Player
+    from modules._random_stream import RandomStream
+
+    found_differences = verify()
+    print(f'Differences from the generic loop: {found_differences if found_differences else "none"}')
+
+    for use_kernels in (False, True):
+        stream = RandomStream.from_seed(0)
+        start = time.perf_counter()
+        for _ in range(2000):
+            Game(player_1=Player(name='1', strategy=CopyCat(start_with=1), initial_score=0),
+                 player_2=Player(name='2', strategy=GenerousCopyKat(forgiveness_prob=0.2), initial_score=0),
+                 name='benchmark', rounds=100, rng=stream, use_kernels=use_kernels).run(mistake_chance=0.05)
+        print(f'{"Kernel" if use_kernels else "Generic loop"}: 2000 games in {time.perf_counter() - start:.2f} seconds')
@@ -0,0 +1,117 @@
+from contextlib import contextmanager
+import json
+import time
+
+
+class Metrics:
+    """Counters of where the time of games and tournaments goes.
+
+    Strategy decisions are only timed once every sample_every rounds, and their time is
+    scaled up by the rounds they stand for, so the metrics are cheap enough to be left on."""
+
+    def __init__(self, sample_every: int = 16):
+        self.sample_every = sample_every
+        self.strategies = {}  # strategy -> [sampled calls, sampled seconds, estimated total seconds]
+        self.timeouts = {}  # strategy -> decisions that didn't come in time (asynchronous strategies)
+        self.forfeits = {}  # strategy -> decisions an asynchronous strategy couldn't make (see Forfeit)
+        self.games = 0
+        self.rounds = 0
+        self.games_seconds = 0.0
+        self.generations_seconds = []
+
+    def __repr__(self):
+        return f'Metrics [{self.games} games, {self.rounds} rounds, {len(self.generations_seconds)} generations]'
+
+    def get_sampled_rounds(self, rounds: int):
+        """
+        The rounds of a game whose decisions are timed, and the number of decisions each stands for.
+
+        The rounds are split to windows of sample_every rounds (the last one may be shorter), and the
+        middle round of every window is timed for the whole window, so the opening round isn't always the sample.
+
+        Parameters:
+        rounds (int): Number of rounds in the game.
+
+        Returns:
+        dict: The weight of every sampled round, by its number.
+        """
+        sampled_rounds = {}
+        for window_start in range(0, rounds, self.sample_every):
+            window = min(self.sample_every, rounds - window_start)
+            sampled_rounds[window_start + window // 2] = window
+        return sampled_rounds
+
+    def record_decision(self, strategy, seconds: float, weight: int = 1):
+        """
+        Record the time of a strategy's decision.
+
+        Parameters:
+        strategy (Strategy): The strategy that decided.
+        seconds (float): Time spent in the decision.
+        weight (int): Number of decisions this one stands for (see get_sampled_rounds).
+
+        Returns:
+        None
+        """
+        counters = self.strategies.setdefault(str(strategy), [0, 0.0, 0.0])
+        counters[0] += 1
+        counters[1] += seconds
+        counters[2] += seconds * weight
+
+    def record_timeout(self, strategy):
+        self.timeouts[str(strategy)] = self.timeouts.get(str(strategy), 0) + 1
+
+    def record_forfeit(self, strategy):
+        self.forfeits[str(strategy)] = self.forfeits.get(str(strategy), 0) + 1
+
+    def record_games(self, games: int, rounds: int, seconds: float):
+        self.games += games
+        self.rounds += rounds
+        self.games_seconds += seconds
+
+    @contextmanager
+    def measure_generation(self):
+        start = time.perf_counter()
+        yield
+        self.generations_seconds.append(time.perf_counter() - start)
+
+    def merge(self, other):
+        """Add the counters of other metrics (e.g. from a worker process) to these"""
+        for strategy, (calls, seconds, estimated_seconds) in other.strategies.items():
+            counters = self.strategies.setdefault(strategy, [0, 0.0, 0.0])
+            counters[0] += calls
+            counters[1] += seconds
+            counters[2] += estimated_seconds
+        for strategy, timeouts in other.timeouts.items():
+            self.timeouts[strategy] = self.timeouts.get(strategy, 0) + timeouts
+        for strategy, forfeits in other.forfeits.items():
+            self.forfeits[strategy] = self.forfeits.get(strategy, 0) + forfeits
+        self.record_games(other.games, other.rounds, other.games_seconds)
+        self.generations_seconds += other.generations_seconds
+
+    def to_dict(self):
+        strategies = {
+            strategy: {
+                'sampled_calls': calls,
+                'seconds_per_call': seconds / calls,
+                'estimated_seconds': estimated_seconds,
+            }
+            for strategy, (calls, seconds, estimated_seconds)
+            in sorted(self.strategies.items(), key=lambda item: item[1][2], reverse=True)
+        }
+
+        return {
+            'games': self.games,
+            'rounds': self.rounds,
+            'games_seconds': self.games_seconds,
+            'games_per_second': self.games / self.games_seconds if self.games_seconds else None,
+            'rounds_per_second': self.rounds / self.games_seconds if self.games_seconds else None,
+            'generations_seconds': self.generations_seconds,
+            'strategies': strategies,
+            'timeouts': self.timeouts,
+            'forfeits': self.forfeits,
+        }
+
+    def to_json(self, path: str):
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
@@ -0,0 +1,139 @@
+import numpy as np
+
+
+class Payoff:
+    """The score of a player in a round, by its action and the opponent's.
+
+    temptation (T) - I cheat and the opponent cooperates,
+    reward (R) - we both cooperate,
+    punishment (P) - we both cheat,
+    sucker (S) - I cooperate and the opponent cheats.
+
+    A game's scores only depend on how many rounds ended with every joint action, so they are
+    computed once per game from the counts of the joint actions, instead of round by round."""
+
+    def __init__(self, temptation=3, reward=2, punishment=0, sucker=-1):
+        """
+        Initialize the payoff, by default the donation game the tournaments always used
+        (cooperating gives the opponent 3 and costs 1).
+
+        Parameters:
+        temptation (int or float): T, the score of cheating a cooperating opponent.
+        reward (int or float): R, the score of mutual cooperation.
+        punishment (int or float): P, the score of mutual cheating.
+        sucker (int or float): S, the score of cooperating with a cheating opponent.
+
+        Returns:
+        None
+        """
+        self.temptation = temptation
+        self.reward = reward
+        self.punishment = punishment
+        self.sucker = sucker
+
+        # The score of each player by the joint action 2 * first player's action + second player's action
+        self.table_1 = (punishment, temptation, sucker, reward)
+        self.table_2 = (punishment, sucker, temptation, reward)
+
+    def __repr__(self):
+        return f'Payoff [T={self.temptation}, R={self.reward}, P={self.punishment}, S={self.sucker}]'
+
+    def __eq__(self, other):
+        return isinstance(other, Payoff) and self.table_1 == other.table_1
+
+    def __hash__(self):
+        return hash(self.table_1)
+
+    @classmethod
+    def donation(cls, benefit=3, cost=1):
+        """Cooperating gives the opponent benefit and costs cost, cheating does nothing"""
+        return cls(temptation=benefit, reward=benefit - cost, punishment=0, sucker=-cost)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create a payoff from its config.
+
+        Parameters:
+        config (Payoff, dict or None): A payoff, None for the default one, or a dict of either
+                                       temptation, reward, punishment and sucker (or T, R, P and S),
+                                       or benefit and cost (or b and c) of a donation game.
+
+        Returns:
+        Payoff: The payoff.
+        """
+        if config is None:
+            return cls()
+        if isinstance(config, Payoff):
+            return config
+
+        short_names = {'T': 'temptation', 'R': 'reward', 'P': 'punishment', 'S': 'sucker', 'b': 'benefit', 'c': 'cost'}
+        arguments = {short_names.get(key, key): value for key, value in config.items()}
+        if 'benefit' in arguments or 'cost' in arguments:
+            return cls.donation(**arguments)
+        return cls(**arguments)
+
+    def to_dict(self):
+        return {'temptation': self.temptation, 'reward': self.reward,
+                'punishment': self.punishment, 'sucker': self.sucker}
+
+    @property
+    def dtype(self):
+        """The type of score arrays, integers unless a payoff isn't one"""
+        if all(isinstance(value, (int, np.integer)) for value in self.table_1):
+            return np.int64
+        return np.float64
+
+    @property
+    def is_prisoners_dilemma(self):
+        """Whether cheating dominates but mutual cooperation is best (T > R > P > S and 2R > T + S)"""
+        return self.temptation > self.reward > self.punishment > self.sucker and \
+            2 * self.reward > self.temptation + self.sucker
+
+    def get_round_scores(self, action_1: int, action_2: int):
+        """The scores of both players in a single round"""
+        joint_action = 2 * action_1 + action_2
+        return self.table_1[joint_action], self.table_2[joint_action]
+
+    def get_scores(self, cooperations_1, cooperations_2, both_cooperated, rounds):
+        """
+        The scores of both players in a game (or in many games, given arrays of counts).
+
+        Parameters:
+        cooperations_1: Number of rounds the first player cooperated in.
+        cooperations_2: Number of rounds the second player cooperated in.
+        both_cooperated: Number of rounds both players cooperated in.
+        rounds: Number of rounds.
+
+        Returns:
+        tuple: (score_1, score_2) the score of each player.
+        """
+        # Number of rounds of every joint action, in the order of the tables
+        counts = (rounds - cooperations_1 - cooperations_2 + both_cooperated,
+                  cooperations_2 - both_cooperated,
+                  cooperations_1 - both_cooperated,
+                  both_cooperated)
+
+        score_1 = sum(count * score for count, score in zip(counts, self.table_1))
+        score_2 = sum(count * score for count, score in zip(counts, self.table_2))
+        return score_1, score_2
+
+    def get_game_scores(self, moves_1, moves_2):
+        """
+        The scores of both players in a game, from its moves.
+
+        Parameters:
+        moves_1 (array): The moves of the first player, a byte (0 or 1) per round.
+        moves_2 (array): The moves of the second player, a byte (0 or 1) per round.
+
+        Returns:
+        tuple: (score_1, score_2) the score of each player.
+        """
+        # Every move is a 0 or 1 byte, so the bits of the moves' bytes count the cooperations
+        both_cooperated = bin(int.from_bytes(moves_1.tobytes(), 'little') &
+                              int.from_bytes(moves_2.tobytes(), 'little')).count('1')
+        return self.get_scores(moves_1.count(1), moves_2.count(1), both_cooperated, len(moves_1))
+
+
+# Used by games and tournaments created without a payoff of their own
+default_payoff = Payoff()
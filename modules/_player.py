@@ -1,13 +1,17 @@
 from abc import abstractmethod
-from _strategy import Strategy
+from modules._strategy import Strategy
 import re
 
 
 class Player:
-    def __init__(self, name: str, strategy: Strategy, initial_score: int, version: int = 0, debug: bool = False):
+    def __init__(self, name: str, strategy: Strategy, initial_score: int, version: int = 0,
+                 keep_moves: bool = False, debug: bool = False):
         self.name = name
         self.strategy = strategy
         self.score = self.initial_score = initial_score
+        # The moves of the games are already kept by each Game. Players that keep their own aren't
+        # played by vectorized batches or from the cache, and the 'process' backend doesn't keep them
+        self.keep_moves = keep_moves
         self.moves = []
         self.version = version
         self.scores_history = []
@@ -25,9 +29,16 @@ class Player:
         self.score += add
         self.score += subtract
 
-    def get_action_and_thoughts(self, self_moves, opponent_moves):
-        action, thoughts = self.strategy.get_recommended_action(self_moves, opponent_moves)
-        self.moves.append(action)
+    def get_action(self, self_moves, opponent_moves, memory):
+        action = self.strategy.get_action(self_moves, opponent_moves, memory)
+        if self.keep_moves:
+            self.moves.append(action)
+        return action
+
+    def get_action_and_thoughts(self, self_moves, opponent_moves, memory):
+        action, thoughts = self.strategy.get_recommended_action(self_moves, opponent_moves, memory)
+        if self.keep_moves:
+            self.moves.append(action)
         return action, thoughts
 
     def reset(self):
@@ -38,5 +49,6 @@ class Player:
     def multiply(self):
         new_player = Player(name=self.name,
                             strategy=self.strategy,
-                            initial_score=self.initial_score)
+                            initial_score=self.initial_score,
+                            keep_moves=self.keep_moves)
         return new_player
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class RandomStream:
+    """Random numbers of games and strategies, drawn from a NumPy Generator in blocks.
+
+    Drawing one number at a time from NumPy is slow, so the numbers are drawn
+    block_size at a time and handed out one by one. Every stream is independent of
+    the global random module, so seeded streams give reproducible games, also in
+    parallel workers."""
+
+    def __init__(self, generator: np.random.Generator = None, block_size: int = 4096):
+        """
+        Initialize the stream.
+
+        Parameters:
+        generator (np.random.Generator): The generator to draw from (a new unseeded one when None).
+        block_size (int): Number of values drawn at once.
+
+        Returns:
+        None
+        """
+        self.generator = generator if generator is not None else np.random.default_rng()
+        self.block_size = block_size
+        self.values = iter(())
+
+    def __repr__(self):
+        return f'RandomStream [{self.block_size}]'
+
+    @classmethod
+    def from_seed(cls, seed: int = None, block_size: int = 4096):
+        return cls(np.random.default_rng(seed), block_size)
+
+    def get_state(self):
+        """
+        Get the state of the stream, to continue it later with set_state.
+
+        Returns:
+        tuple: (generator_state, values) the state dict of the generator's bit generator,
+               and an array of the drawn values that weren't used yet.
+        """
+        values = list(self.values)
+        self.values = iter(values)
+        return self.generator.bit_generator.state, np.array(values, dtype=np.float64)
+
+    def set_state(self, generator_state, values):
+        self.generator.bit_generator.state = generator_state
+        self.values = iter(values.tolist())
+
+    def random(self):
+        """A float in [0, 1), like random.random"""
+        try:
+            return next(self.values)
+        except StopIteration:
+            self.values = iter(self.generator.random(self.block_size).tolist())
+            return next(self.values)
+
+    def coin(self):
+        """0 or 1 with the same probability, like random.randint(0, 1)"""
+        return 1 if self.random() < 0.5 else 0
+
+    def mistakes(self, rounds: int, mistake_chance: float):
+        """
+        Draw the mistakes of both players of a whole game at once.
+
+        Parameters:
+        rounds (int): Number of rounds in the game.
+        mistake_chance (float): Probability of every single action being flipped.
+
+        Returns:
+        tuple: (flips_1, flips_2) lists with a bool per round, True where the action is flipped.
+        """
+        if mistake_chance <= 0:
+            no_flips = [False] * rounds
+            return no_flips, no_flips
+
+        flips = (self.generator.random(2 * rounds) < mistake_chance).tolist()
+        return flips[:rounds], flips[rounds:]
+
+
+# Used by games and memories created without a stream of their own
+default_stream = RandomStream()
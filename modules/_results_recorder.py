@@ -0,0 +1,191 @@
+import glob
+import importlib.util
+import os
+import numpy as np
+
+
+def has_pyarrow():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def import_parquet():
+    """pyarrow and its parquet module, imported only when parquet files are used (pyarrow is slow to import)"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Parquet files require pyarrow') from None
+    return pyarrow, pyarrow.parquet
+
+
+class ResultsRecorder:
+    """Writes the results of tournaments to disk as columns, a batch at a time.
+
+    There are three tables:
+    games - the score of both players in every game,
+    players - the final score of every player in every generation,
+    generations - the number of players and total score of every strategy in every generation.
+
+    Every batch is written to a separate file, a Parquet file with pyarrow or a NumPy .npz
+    file without it, so the batches written before a crash can still be read.
+    A recorder on an existing directory adds files after the existing ones.
+    Use load_results to read a table back."""
+
+    columns = {
+        'games': ('generation', 'player_1', 'player_2', 'strategy_1', 'strategy_2', 'score_1', 'score_2'),
+        'players': ('generation', 'player', 'strategy', 'score'),
+        'generations': ('generation', 'strategy', 'count', 'total_score'),
+    }
+
+    def __init__(self, directory: str, batch_size: int = 100000, file_format: str = None):
+        """
+        Initialize the recorder.
+
+        Parameters:
+        directory (str): Directory of the tables, created if needed.
+        batch_size (int): Number of rows of a table kept in memory before they are written.
+        file_format (str): 'parquet' or 'npz', None for parquet when pyarrow is installed.
+
+        Returns:
+        None
+        """
+        if file_format is None:
+            file_format = 'parquet' if has_pyarrow() else 'npz'
+        if file_format not in ('parquet', 'npz'):
+            raise ValueError(f'Unknown file format "{file_format}"')
+        if file_format == 'parquet':
+            import_parquet()
+
+        self.directory = directory
+        self.batch_size = batch_size
+        self.file_format = file_format
+        os.makedirs(directory, exist_ok=True)
+
+        self.buffers = {table: {column: [] for column in columns} for table, columns in self.columns.items()}
+        self.batches_written = {table: len(get_parts(directory, table, file_format)) for table in self.columns}
+
+    def __repr__(self):
+        return f'ResultsRecorder [{self.directory}, {self.file_format}]'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def record_game(self, generation, player_1, player_2, strategy_1, strategy_2, score_1, score_2):
+        """Record a single game, see record_games"""
+        buffer = self.buffers['games']
+        buffer['generation'].append(generation)
+        buffer['player_1'].append(player_1)
+        buffer['player_2'].append(player_2)
+        buffer['strategy_1'].append(strategy_1)
+        buffer['strategy_2'].append(strategy_2)
+        buffer['score_1'].append(score_1)
+        buffer['score_2'].append(score_2)
+        self.flush_if_full('games')
+
+    def record_games(self, generation, players_1, players_2, strategies_1, strategies_2, scores_1, scores_2):
+        """
+        Record a batch of games.
+
+        Parameters:
+        generation (int): The generation the games were played in.
+        players_1 (np.ndarray): Index of the first player of every game.
+        players_2 (np.ndarray): Index of the second player of every game.
+        strategies_1 (np.ndarray): Strategy name of the first player of every game.
+        strategies_2 (np.ndarray): Strategy name of the second player of every game.
+        scores_1 (np.ndarray): Score change of the first player in every game.
+        scores_2 (np.ndarray): Score change of the second player in every game.
+
+        Returns:
+        None
+        """
+        self.extend('games', generation=[generation] * len(players_1),
+                    player_1=players_1, player_2=players_2,
+                    strategy_1=strategies_1, strategy_2=strategies_2,
+                    score_1=scores_1, score_2=scores_2)
+
+    def record_players(self, generation, players):
+        """Record the score of every player at the end of a generation's tournament"""
+        self.extend('players', generation=[generation] * len(players),
+                    player=range(len(players)),
+                    strategy=[str(player.strategy) for player in players],
+                    score=[player.score for player in players])
+
+        counts = {}
+        total_scores = {}
+        for player in players:
+            strategy = str(player.strategy)
+            counts[strategy] = counts.get(strategy, 0) + 1
+            total_scores[strategy] = total_scores.get(strategy, 0) + player.score
+
+        self.extend('generations', generation=[generation] * len(counts),
+                    strategy=list(counts), count=list(counts.values()), total_score=list(total_scores.values()))
+
+    def extend(self, table, **columns):
+        buffer = self.buffers[table]
+        for column, values in columns.items():
+            buffer[column].extend(values.tolist() if isinstance(values, np.ndarray) else values)
+        self.flush_if_full(table)
+
+    def flush_if_full(self, table):
+        if len(self.buffers[table]['generation']) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table: str = None):
+        """Write the buffered rows of a table (of all the tables when None)"""
+        for table in [table] if table is not None else list(self.columns):
+            buffer = self.buffers[table]
+            if not buffer['generation']:
+                continue
+
+            arrays = {column: np.array(values) for column, values in buffer.items()}
+            path = os.path.join(self.directory,
+                                f'{table}-{str(self.batches_written[table]).zfill(5)}.{self.file_format}')
+
+            if self.file_format == 'parquet':
+                pa, pq = import_parquet()
+                pq.write_table(pa.table(arrays), path)
+            else:
+                np.savez(path, **arrays)
+
+            self.batches_written[table] += 1
+            self.buffers[table] = {column: [] for column in buffer}
+
+    def close(self):
+        self.flush()
+
+
+def get_parts(directory, table, file_format):
+    return sorted(glob.glob(os.path.join(directory, f'{table}-*.{file_format}')))
+
+
+def load_results(directory: str, table: str):
+    """
+    Read a table written by a ResultsRecorder.
+
+    Parameters:
+    directory (str): The recorder's directory.
+    table (str): 'games', 'players' or 'generations'.
+
+    Returns:
+    dict: The column name -> np.ndarray of the column's values.
+    """
+    columns = {}
+
+    for part in get_parts(directory, table, 'parquet'):
+        _, pq = import_parquet()
+        data = pq.read_table(part)
+        for column in data.column_names:
+            columns.setdefault(column, []).append(data.column(column).to_numpy())
+
+    for part in get_parts(directory, table, 'npz'):
+        with np.load(part) as arrays:
+            for column in arrays.files:
+                columns.setdefault(column, []).append(arrays[column])
+
+    if not columns:
+        raise FileNotFoundError(f'No "{table}" results in {directory}')
+
+    return {column: np.concatenate(values) for column, values in columns.items()}
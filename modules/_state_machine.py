@@ -0,0 +1,167 @@
+from array import array
+from collections import deque
+import copy
+import hashlib
+from modules._strategy import Strategy, Memory
+import numpy as np
+
+
+class StateMachine:
+    """A strategy as a finite-state machine.
+
+    actions[state] is the action the machine recommends in a state, and
+    transitions[state, my_action, opponent_action] the state it moves to after a round
+    with these final actions (after mistakes). Every game starts in state 0."""
+
+    def __init__(self, actions, transitions, name: str = 'StateMachine'):
+        """
+        Initialize the machine.
+
+        Parameters:
+        actions (np.ndarray): (states,) action (0 or 1) of every state.
+        transitions (np.ndarray): (states, 2, 2) next state by state, my final action and opponent's final action.
+        name (str): Name of the strategy the machine plays.
+
+        Returns:
+        None
+        """
+        self.actions = np.asarray(actions, dtype=np.int8)
+        self.transitions = np.asarray(transitions, dtype=np.int64)
+        self.name = name
+
+        states = len(self.actions)
+        if self.transitions.shape != (states, 2, 2):
+            raise ValueError(f'Transitions must be of shape ({states}, 2, 2), got {self.transitions.shape}')
+        if states == 0 or self.transitions.min() < 0 or self.transitions.max() >= states:
+            raise ValueError('Transitions must lead to states of the machine')
+
+    def __repr__(self):
+        # Caches and checkpoints tell strategies apart by their str, so it has the tables' digest
+        return f'StateMachine [{self.name}, {self.states} states, {self.digest}]'
+
+    @property
+    def states(self):
+        return len(self.actions)
+
+    @property
+    def digest(self):
+        """A short hash of the tables, the same only for machines with the same tables"""
+        tables = self.actions.tobytes() + self.transitions.tobytes()
+        return hashlib.blake2b(tables, digest_size=8).hexdigest()
+
+    @classmethod
+    def random(cls, states: int, rng: np.random.Generator, name: str = 'StateMachine'):
+        """A machine with uniformly random actions and transitions, e.g. to start an evolution from"""
+        return cls(actions=rng.integers(0, 2, states, dtype=np.int8),
+                   transitions=rng.integers(0, states, (states, 2, 2)),
+                   name=name)
+
+
+def copy_memory(memory: Memory):
+    """Copy a memory, sharing its random stream instead of copying it"""
+    return copy.deepcopy(memory, {id(memory.rng): memory.rng})
+
+
+def compile_strategy(strategy: Strategy, max_states: int = 10000):
+    """
+    Compile a deterministic, memory-bounded strategy to a state machine.
+
+    The states are the distinct state keys (Strategy.get_state_key) the strategy reaches from
+    a new game, exploring every combination of final actions after every state, so the machine
+    also plays the same as the strategy in games with mistakes.
+
+    Parameters:
+    strategy (Strategy): The strategy to compile.
+    max_states (int): Give up when the strategy reaches more states than this.
+
+    Returns:
+    StateMachine: The machine, named after the strategy.
+    """
+    if not strategy.deterministic:
+        raise ValueError(f'{strategy} is not deterministic, so it has no state machine')
+
+    memory = strategy.new_memory()
+    key = strategy.get_state_key(memory)
+    if key is None:
+        raise ValueError(f'{strategy} has no state keys (get_state_key), so it can not be compiled')
+
+    # The memory and the moves that first reached every state
+    states = {key: 0}
+    pending = deque([(memory, array('b'), array('b'))])
+    actions = []
+    transitions = []
+
+    while pending:
+        memory, self_moves, opponent_moves = pending.popleft()
+
+        # Deciding can change the memory (e.g. Forgiver counts its forgiving rounds), so it is done once per state
+        action = strategy.get_action(memoryview(self_moves).toreadonly(), memoryview(opponent_moves).toreadonly(),
+                                     memory)
+        actions.append(action)
+
+        state_transitions = np.empty((2, 2), dtype=np.int64)
+        for my_action in (0, 1):
+            for opponent_action in (0, 1):
+                next_memory = copy_memory(memory)
+                strategy.observe(next_memory, my_action, opponent_action)
+                next_key = strategy.get_state_key(next_memory)
+
+                if next_key not in states:
+                    if len(states) >= max_states:
+                        raise ValueError(f'{strategy} has more than {max_states} states')
+                    states[next_key] = len(states)
+                    pending.append((next_memory, self_moves + array('b', [my_action]),
+                                    opponent_moves + array('b', [opponent_action])))
+
+                state_transitions[my_action, opponent_action] = states[next_key]
+
+        transitions.append(state_transitions)
+
+    return StateMachine(actions=actions, transitions=transitions, name=strategy.name)
+
+
+class StateMachineStrategy(Strategy):
+    """Plays a state machine, so compiled and evolved machines can play in any game or tournament"""
+
+    vectorized = True
+    deterministic = True
+
+    class StateMachineMemory(Memory):
+        __slots__ = ('state',)
+
+        def __init__(self, rng=None):
+            super().__init__(rng)
+            self.state = 0  # The machine's current state
+
+    memory_class = StateMachineMemory
+
+    thoughts = {None: "My state machine is in state {memory.state}"}
+
+    def __init__(self, machine: StateMachine):
+        self.machine = machine
+        # Lists are faster to index one at a time than arrays
+        self.actions = machine.actions.tolist()
+        self.transitions = machine.transitions.tolist()
+        super().__init__(machine.name)
+
+    def __repr__(self):
+        return f'{self.name} [{self.machine}]'
+
+    def get_action(self, self_moves, opponent_moves, memory):
+        return self.actions[memory.state]
+
+    def observe(self, memory, my_action, opponent_action):
+        super().observe(memory, my_action, opponent_action)
+        memory.state = self.transitions[memory.state][my_action][opponent_action]
+
+    def get_state_key(self, memory):
+        return memory.state
+
+    def new_vectorized_state(self, games):
+        # The current state of every game
+        return np.zeros(games, dtype=np.int64)
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        if self_moves.shape[1] > 0:
+            state[:] = self.machine.transitions[state, self_moves[:, -1], opponent_moves[:, -1]]
+        return self.machine.actions[state]
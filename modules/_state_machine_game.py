@@ -0,0 +1,124 @@
+from modules._metrics import Metrics
+from modules._payoff import Payoff, default_payoff
+import numpy as np
+import time
+
+
+class StateMachineGames:
+    """Plays many games between state machines at once, by table lookup.
+
+    The tables of all the machines are stacked into one, so every round of all
+    the games is a lookup of the actions and a lookup of the next states.
+    Only the current states and the counts of the joint actions are kept, not the moves."""
+
+    def __init__(self, machines_1, machines_2, rounds: int, rng: np.random.Generator = None,
+                 payoff: Payoff = None, metrics: Metrics = None):
+        """
+        Initialize a batch of games.
+
+        Parameters:
+        machines_1 (list): The state machine of the first player of every game.
+        machines_2 (list): The state machine of the second player of every game.
+        rounds (int): Number of rounds in every game.
+        rng (np.random.Generator): Random generator for mistakes.
+        payoff (Payoff): The scores of a round, the default donation game when None.
+        metrics (Metrics): Records the time of the whole batch.
+
+        Returns:
+        None
+        """
+        if len(machines_1) != len(machines_2):
+            raise ValueError('Both sides must have the same number of games')
+
+        self.games = len(machines_1)
+        self.rounds = rounds
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.payoff = payoff if payoff is not None else default_payoff
+        self.metrics = metrics
+
+        # Every machine's states get a range of the stacked table, starting at its offset
+        offsets = {}
+        machines = []
+        states = 0
+        for machine in list(machines_1) + list(machines_2):
+            if id(machine) not in offsets:
+                offsets[id(machine)] = states
+                machines.append(machine)
+                states += machine.states
+
+        self.actions = np.concatenate([machine.actions for machine in machines])
+        # Flat, the next state of (state, my action, opponent action) is at 4 * state + 2 * my action + opponent action
+        self.transitions = np.concatenate([(machine.transitions + offsets[id(machine)]).ravel()
+                                           for machine in machines])
+
+        self.initial_states_1 = np.array([offsets[id(machine)] for machine in machines_1], dtype=np.int64)
+        self.initial_states_2 = np.array([offsets[id(machine)] for machine in machines_2], dtype=np.int64)
+
+    def run(self, mistake_chance: float = .0):
+        """
+        Play all the games.
+
+        Parameters:
+        mistake_chance (float): Probability of every single action being flipped.
+
+        Returns:
+        tuple: (scores_1, scores_2) arrays with the score change of each player in every game.
+        """
+        start_time = time.perf_counter()
+
+        states_1 = self.initial_states_1.copy()
+        states_2 = self.initial_states_2.copy()
+        cooperations_1 = np.zeros(self.games, dtype=np.int64)
+        cooperations_2 = np.zeros(self.games, dtype=np.int64)
+        both_cooperated = np.zeros(self.games, dtype=np.int64)
+
+        for _ in range(self.rounds):
+            actions_1 = self.actions[states_1]
+            actions_2 = self.actions[states_2]
+
+            if mistake_chance > 0:
+                actions_1 ^= self.rng.random(self.games) < mistake_chance
+                actions_2 ^= self.rng.random(self.games) < mistake_chance
+
+            cooperations_1 += actions_1
+            cooperations_2 += actions_2
+            both_cooperated += actions_1 & actions_2
+
+            states_1 = self.transitions[4 * states_1 + 2 * actions_1 + actions_2]
+            states_2 = self.transitions[4 * states_2 + 2 * actions_2 + actions_1]
+
+        if self.metrics is not None:
+            self.metrics.record_games(self.games, self.games * self.rounds, time.perf_counter() - start_time)
+
+        return self.payoff.get_scores(cooperations_1, cooperations_2, both_cooperated, self.rounds)
+
+
+if __name__ == '__main__':
+    from modules._state_machine import compile_strategy
+    from modules.strategies.strategies import *
+
+    machine_strategies = [
+        GoodyTwoShoes(),
+        Cheater(),
+        CopyCat(start_with=1),
+        CopyKitten(defined_limit=2, start_with=1),
+        Grudger(defined_limit=3),
+        Sequential(sequence=[1, 0, 0, 1, 1, 0]),
+        Alternator(alternate_after=2, start_with=1),
+        Pavlovian(start_with=1),
+        Forgiver(grudge_limit=3, copy_kitten_limit=2, copy_kitten_start_with=1),
+        Businessman(random_actions=4, kindness_limit=0, copy_kitten_limit=2, copy_kitten_start_with=1),
+    ]
+    compiled = [compile_strategy(strategy) for strategy in machine_strategies]
+    for machine in compiled:
+        print(machine)
+
+    # Every ordered pair, 1000 times
+    pairs = [(a, b) for a in range(len(compiled)) for b in range(len(compiled))] * 1000
+    games = StateMachineGames(machines_1=[compiled[a] for a, _ in pairs],
+                              machines_2=[compiled[b] for _, b in pairs],
+                              rounds=100,
+                              rng=np.random.default_rng(0))
+    start = time.perf_counter()
+    scores_1, _ = games.run(mistake_chance=0.05)
+    print(f'{len(pairs)} games in {time.perf_counter() - start:.2f} seconds')
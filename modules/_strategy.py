@@ -1,8 +1,48 @@
 from abc import ABC, abstractmethod
-import random
+from modules._random_stream import RandomStream, default_stream
+
+
+class Memory:
+    """What a strategy remembers about a single game.
+    It is updated once per round by Strategy.observe, so strategies
+    don't need to re-scan the moves history every round"""
+
+    __slots__ = ('rounds_played', 'my_cooperations', 'opponent_cooperations',
+                 'my_last_action', 'opponent_last_action', 'opponent_streak', 'reason', 'rng')
+
+    def __init__(self, rng: RandomStream = None):
+        self.rounds_played = 0
+        self.my_cooperations = 0
+        self.opponent_cooperations = 0
+        self.my_last_action = None
+        self.opponent_last_action = None
+        self.opponent_streak = 0  # How many times in a row the opponent repeated their last action
+        self.reason = None  # Key of the strategy's thoughts explaining its last decision
+        self.rng = rng if rng is not None else default_stream  # Random numbers of the strategy in this game
+
+    @property
+    def opponent_cheats(self):
+        return self.rounds_played - self.opponent_cooperations
 
 
 class Strategy(ABC):
+    # Strategies that implement get_vectorized_actions set this to True,
+    # so they can be played in batches by VectorizedGames
+    vectorized = False
+
+    # Strategies that never use randomness set this to True, so their games
+    # without mistakes can be cached (the same matchup always ends the same way)
+    deterministic = False
+
+    # The per-game memory of the strategy, strategies that need
+    # more counters can extend it (and observe)
+    memory_class = Memory
+
+    # Explanations of the decisions, by the reason get_action left in the memory.
+    # They are formatted with the strategy and its memory only when explain is called.
+    # A strategy with a single explanation keeps it under None.
+    thoughts = {}
+
     def __init__(self, name):
         self.name = name
 
@@ -16,6 +56,102 @@ class Strategy(ABC):
 
         return result
 
+    def new_memory(self, rng: RandomStream = None):
+        """Create the memory of a new game, random strategies draw from its rng"""
+        return self.memory_class(rng)
+
+    def observe(self, memory, my_action, opponent_action):
+        """
+        Update the memory after a round was played.
+
+        Parameters:
+        memory (Memory): The memory of the game, as returned by new_memory.
+        my_action (int): The player's final action in the round (after mistakes).
+        opponent_action (int): The opponent's final action in the round (after mistakes).
+
+        Returns:
+        None
+        """
+        if opponent_action == memory.opponent_last_action:
+            memory.opponent_streak += 1
+        else:
+            memory.opponent_streak = 1
+
+        memory.rounds_played += 1
+        memory.my_cooperations += my_action
+        memory.opponent_cooperations += opponent_action
+        memory.my_last_action = my_action
+        memory.opponent_last_action = opponent_action
+
     @abstractmethod
-    def get_recommended_action(self, self_moves, opponent_moves):
+    def get_action(self, self_moves, opponent_moves, memory):
+        """
+        Get the recommended action, without explaining it.
+
+        Parameters:
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
+
+        Returns:
+        int: The recommended action (0 or 1).
+        """
         pass
+
+    def get_state_key(self, memory):
+        """
+        Get everything the strategy's future decisions depend on, to detect cycles.
+
+        Two memories with equal keys must lead to the same actions, and to equal keys again,
+        when the opponent plays the same. Deterministic strategies can override this,
+        so games without mistakes stop replaying a cycle once both states repeat.
+
+        Parameters:
+        memory (Memory): The strategy's memory of the current game.
+
+        Returns:
+        object: A hashable key, or None when the strategy doesn't support it (the default).
+        """
+        return None
+
+    def explain(self, memory):
+        """Explain the last decision, based on the reason it left in the memory"""
+        return self.thoughts[memory.reason].format(strategy=self, memory=memory)
+
+    def get_recommended_action(self, self_moves, opponent_moves, memory):
+        """
+        Get the recommended action and its explanation (slower than get_action).
+
+        Returns:
+        tuple: (action, explanation) where action is the recommended action (0 or 1)
+               and explanation is a string explaining the decision.
+        """
+        action = self.get_action(self_moves, opponent_moves, memory)
+        return action, self.explain(memory)
+
+    def new_vectorized_state(self, games):
+        """
+        Create the state this strategy keeps between rounds of a vectorized batch.
+
+        Parameters:
+        games (int): Number of games in the batch played by this strategy.
+
+        Returns:
+        object: Any state the strategy needs (None by default).
+        """
+        return None
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        """
+        Get the recommended actions of many games at once.
+
+        Parameters:
+        self_moves (np.ndarray): (games, rounds played) int8 matrix of the player's previous moves.
+        opponent_moves (np.ndarray): (games, rounds played) int8 matrix of the opponents' previous moves.
+        state (object): The state returned by new_vectorized_state.
+        rng (np.random.Generator): The random generator of the batch.
+
+        Returns:
+        np.ndarray: int8 array with the action (0 or 1) of every game.
+        """
+        raise NotImplementedError(f'{self.name} can not be played vectorized')
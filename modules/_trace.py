@@ -0,0 +1,213 @@
+from queue import Queue
+from threading import Thread
+import argparse
+import json
+
+
+class TraceWriter:
+    """Writes the rounds of chosen games to a JSON Lines file, from a background thread.
+
+    Every traced game starts with a 'game' event (its players and strategies), followed by a 'round'
+    event per round (actions, mistakes, thoughts and the players' scores). Events are buffered and
+    handed to the thread batch_size at a time, so the games only pay for building the events.
+    Use render_trace (or python -m modules._trace) to show a trace like Game's debug output."""
+
+    def __init__(self, path: str, players=None, pairs=None, games=None, batch_size: int = 1000,
+                 append: bool = False):
+        """
+        Initialize the writer.
+
+        Parameters:
+        path (str): The JSON Lines file.
+        players (list): Names of players, trace only their games.
+        pairs (list): (name, name) pairs of players, trace only the games between them (in any order).
+        games (list): Names of games, trace only them.
+        batch_size (int): Number of events handed to the writing thread at once.
+        append (bool): Add to the file (e.g. when resuming a run) instead of overwriting it.
+        When no filter is given, every game is traced.
+
+        Returns:
+        None
+        """
+        self.path = path
+        self.players = set(players) if players is not None else None
+        self.pairs = {frozenset(pair) for pair in pairs} if pairs is not None else None
+        self.games = set(games) if games is not None else None
+        self.batch_size = batch_size
+
+        self.events = []
+        self.batches = Queue(maxsize=16)  # Bounded, so a slow disk slows the games instead of filling the memory
+        self.file = open(path, 'a' if append else 'w')
+        self.thread = Thread(target=self.write_batches, name='TraceWriter', daemon=True)
+        self.thread.start()
+
+    def __repr__(self):
+        return f'TraceWriter [{self.path}]'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def wants_players(self, player_1: str, player_2: str):
+        """Whether games between these players may be traced (the game's name isn't known yet)"""
+        if self.players is not None and player_1 not in self.players and player_2 not in self.players:
+            return False
+        if self.pairs is not None and frozenset((player_1, player_2)) not in self.pairs:
+            return False
+        return True
+
+    def may_want(self, player: str):
+        """Whether some games of this player may be traced"""
+        if self.players is not None and player in self.players:
+            return True
+        if self.pairs is not None:
+            return any(player in pair for pair in self.pairs)
+        return self.players is None
+
+    def wants_game(self, name: str, player_1: str, player_2: str):
+        """Whether the game of this name, between these players, is traced"""
+        if self.games is not None and name not in self.games:
+            return False
+        return self.wants_players(player_1, player_2)
+
+    def wants(self, game):
+        return self.wants_game(game.name, game.player_1.name, game.player_2.name)
+
+    def write(self, event: dict):
+        self.events.append(event)
+        if len(self.events) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.events:
+            self.batches.put(self.events)
+            self.events = []
+
+    def write_batches(self):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                return
+            self.file.write(''.join(json.dumps(event) + '\n' for event in batch))
+
+    def close(self):
+        if self.thread.is_alive():
+            self.flush()
+            self.batches.put(None)
+            self.thread.join()
+        self.file.close()
+
+
+def bring_to_length(string, min_allowed_length):
+    spaces = ''
+    if len(string) < min_allowed_length:
+        spaces = ' ' * (min_allowed_length - len(string))
+    return string + spaces
+
+
+def format_two_paragraphs(sentence_1, sentence_2, paragraph_width):
+    def split_string_by_length(input_string, n):
+        return [input_string[j:j + n] for j in range(0, len(input_string), n)]
+
+    res1 = split_string_by_length(sentence_1, paragraph_width)
+    res2 = split_string_by_length(sentence_2, paragraph_width)
+
+    left_tabs = '\t' * 4
+    middle_tabs = '\t' * 2
+
+    lines = []
+
+    for i in range(max([len(res1), len(res2)])):
+        left_text = res1[i] if i < len(res1) else ''
+        left_text_length = len(left_text)
+
+        left_padding = paragraph_width - left_text_length
+        left_spaces = ' ' * left_padding
+
+        left_part = left_text + left_spaces
+
+        right_text = res2[i] if i < len(res2) else ''
+
+        new_line = left_tabs + left_part + middle_tabs + right_text
+
+        lines.append(new_line)
+
+    return '\n'.join(lines)
+
+
+def render_round(game_event: dict, round_event: dict, paragraph_width: int = 25):
+    """
+    Render a round in two columns, one per player.
+
+    Parameters:
+    game_event (dict): The 'game' event of the round's game.
+    round_event (dict): The 'round' event.
+    paragraph_width (int): Width of the left column.
+
+    Returns:
+    str: The actions (with their mistakes), the thoughts and the scores after the round.
+    """
+    print_action_1_final = f'->{round_event["final_1"]}' if round_event['flip_1'] else '\t'
+    print_action_2_final = f'->{round_event["final_2"]}' if round_event['flip_2'] else '\t'
+
+    left_part = bring_to_length(f'{game_event["strategy_1"]} {round_event["action_1"]}{print_action_1_final}',
+                                paragraph_width)
+
+    print_actions = f'\nRound {str(round_event["round"] + 1).zfill(2)}\t\t' + \
+                    left_part + \
+                    f'\t{game_event["strategy_2"]} {round_event["action_2"]}{print_action_2_final}\n'
+
+    tabs = '\t' * 8
+    print_scores = f'\t\t\t\t{round_event["score_1"]}{tabs}{round_event["score_2"]}'
+
+    return '\n'.join([print_actions,
+                      format_two_paragraphs(round_event['thoughts_1'], round_event['thoughts_2'], paragraph_width),
+                      '\n' + print_scores])
+
+
+def read_trace(path: str, game: str = None):
+    """Yield the events of a trace file, only of the given game when given"""
+    with open(path) as file:
+        for line in file:
+            event = json.loads(line)
+            if game is None or event['game'] == game:
+                yield event
+
+
+def render_trace(path: str, game: str = None):
+    """Yield the rendered games and rounds of a trace file (see render_round)"""
+    game_events = {}
+    for event in read_trace(path, game):
+        if event['event'] == 'game':
+            game_events[event['game']] = event
+            yield f'\n{event["game"]} [{event["strategy_1"]} vs. {event["strategy_2"]}]'
+        else:
+            yield render_round(game_events[event['game']], event)
+
+
+def show_trace(path: str, game: str = None, list_games: bool = False):
+    """Print the rendered trace, or only the names and players of its games"""
+    if list_games:
+        for event in read_trace(path, game):
+            if event['event'] == 'game':
+                print(f'{event["game"]} [{event["strategy_1"]} vs. {event["strategy_2"]}]')
+        return
+
+    for text in render_trace(path, game):
+        print(text)
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Show a trace file in two columns, like a debugged game')
+    parser.add_argument('path', help='JSON Lines trace file')
+    parser.add_argument('--game', help='Show only this game')
+    parser.add_argument('--list', action='store_true', help='List the traced games instead')
+    arguments = parser.parse_args(arguments)
+
+    show_trace(arguments.path, arguments.game, arguments.list)
+
+
+if __name__ == '__main__':
+    main()
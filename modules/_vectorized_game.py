@@ -0,0 +1,122 @@
+from modules._metrics import Metrics
+from modules._payoff import Payoff, default_payoff
+import numpy as np
+import time
+
+
+class VectorizedGames:
+    """Plays many games at once as NumPy arrays.
+
+    Every game has two seats (one per player). The moves of all seats are kept in a
+    (seats, rounds) int8 matrix, with the seats ordered by strategy, so that each
+    strategy decides the actions of all its games with a single call per round."""
+
+    def __init__(self, strategies_1, strategies_2, rounds: int, rng: np.random.Generator = None,
+                 payoff: Payoff = None, metrics: Metrics = None):
+        """
+        Initialize a batch of games.
+
+        Parameters:
+        strategies_1 (list): The strategy of the first player of every game.
+        strategies_2 (list): The strategy of the second player of every game.
+        rounds (int): Number of rounds in every game.
+        rng (np.random.Generator): Random generator for mistakes and random strategies.
+        payoff (Payoff): The scores of a round, the default donation game when None.
+        metrics (Metrics): Records the time of every strategy and of the whole batch.
+
+        Returns:
+        None
+        """
+        if len(strategies_1) != len(strategies_2):
+            raise ValueError('Both sides must have the same number of games')
+
+        for strategy in set(strategies_1) | set(strategies_2):
+            if not strategy.vectorized:
+                raise ValueError(f'{strategy} can not be played vectorized')
+
+        self.games = len(strategies_1)
+        self.rounds = rounds
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.payoff = payoff if payoff is not None else default_payoff
+        self.metrics = metrics
+
+        seat_strategies = list(strategies_1) + list(strategies_2)
+
+        # Group the seats by strategy, so every strategy owns a contiguous slice of rows
+        strategy_ids = {}
+        seat_groups = np.array([strategy_ids.setdefault(id(strategy), len(strategy_ids))
+                                for strategy in seat_strategies], dtype=np.int64)
+        self.order = np.argsort(seat_groups, kind='stable')
+
+        # The seat facing each seat, before and after ordering
+        seats = np.arange(2 * self.games)
+        opponents = (seats + self.games) % (2 * self.games)
+        position = np.empty_like(self.order)
+        position[self.order] = seats
+        self.opponents = position[opponents[self.order]]
+
+        self.groups = []
+        bounds = np.flatnonzero(np.diff(seat_groups[self.order])) + 1
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(seats)]):
+            strategy = seat_strategies[self.order[start]]
+            self.groups.append((strategy, start, stop))
+
+        self.moves = np.zeros((2 * self.games, rounds), dtype=np.int8)
+        self.opponent_moves = np.zeros((2 * self.games, rounds), dtype=np.int8)
+
+    def run(self, mistake_chance: float = .0):
+        """
+        Play all the games.
+
+        Parameters:
+        mistake_chance (float): Probability of every single action being flipped.
+
+        Returns:
+        tuple: (scores_1, scores_2) arrays with the score change of each player in every game.
+        """
+        start_time = time.perf_counter()
+
+        seats = 2 * self.games
+        states = [strategy.new_vectorized_state(stop - start) for strategy, start, stop in self.groups]
+
+        # Draw all the mistakes of the batch at once
+        mistakes = self.rng.random((seats, self.rounds)) < mistake_chance
+
+        actions = np.empty(seats, dtype=np.int8)
+
+        for round_number in range(self.rounds):
+            for (strategy, start, stop), state in zip(self.groups, states):
+                decision_start = time.perf_counter()
+
+                actions[start:stop] = strategy.get_vectorized_actions(
+                    self.moves[start:stop, :round_number],
+                    self.opponent_moves[start:stop, :round_number],
+                    state,
+                    self.rng)
+
+                # One call per round for all the games is cheap enough to always time
+                if self.metrics is not None:
+                    self.metrics.record_decision(strategy, time.perf_counter() - decision_start)
+
+            actions ^= mistakes[:, round_number]
+
+            self.moves[:, round_number] = actions
+            self.opponent_moves[:, round_number] = actions[self.opponents]
+
+        scores = self.calculate_scores(self.moves, self.opponent_moves)
+
+        if self.metrics is not None:
+            self.metrics.record_games(self.games, self.games * self.rounds, time.perf_counter() - start_time)
+
+        # Back from strategy order to game order
+        game_scores = np.empty_like(scores)
+        game_scores[self.order] = scores
+        return game_scores[:self.games], game_scores[self.games:]
+
+    def calculate_scores(self, moves, opponent_moves):
+        """The score of every seat, from the counts of the joint actions of its rounds"""
+        cooperations = moves.sum(axis=1, dtype=np.int64)
+        opponent_cooperations = opponent_moves.sum(axis=1, dtype=np.int64)
+        both_cooperated = (moves & opponent_moves).sum(axis=1, dtype=np.int64)
+        scores, _ = self.payoff.get_scores(cooperations, opponent_cooperations, both_cooperated, self.rounds)
+        return scores
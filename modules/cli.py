@@ -0,0 +1,206 @@
+from modules._async_game import SubprocessStrategy
+from modules._metrics import Metrics
+from modules._results_recorder import ResultsRecorder
+from modules._strategy import Strategy
+from modules._trace import TraceWriter
+from modules import _trace
+from modules.tournament import Tournament
+from modules.strategies import strategies as strategies_module
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+
+
+# Options of the 'run' section that are passed to Tournament.run
+RUN_OPTIONS = ('backend', 'batch_size', 'workers', 'chunk_size', 'concurrency', 'move_timeout')
+
+
+def load_config(path: str):
+    """Read a YAML config (or JSON, by the .json extension)"""
+    with open(path) as file:
+        if path.endswith('.json'):
+            return json.load(file)
+
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError('YAML configs require PyYAML (pip install pyyaml), or use a .json config') from None
+        return yaml.safe_load(file)
+
+
+def get_strategy_classes():
+    return {name: value for name, value in vars(strategies_module).items()
+            if isinstance(value, type) and issubclass(value, Strategy) and value is not Strategy}
+
+
+def create_strategy(spec):
+    """
+    Create a strategy from its config.
+
+    Parameters:
+    spec (str or dict): The name of the strategy's class, or a dict of the name and the arguments
+                        of the class, e.g. {'name': 'CopyKitten', 'defined_limit': 2, 'start_with': 1},
+                        or a dict of a name and the command of a process that plays the strategy,
+                        e.g. {'name': 'my bot', 'command': ['python', 'bot.py']} (see SubprocessStrategy).
+
+    Returns:
+    Strategy: The strategy.
+    """
+    if isinstance(spec, str):
+        spec = {'name': spec}
+    arguments = dict(spec)
+    name = arguments.pop('name')
+
+    if 'command' in arguments:
+        return SubprocessStrategy(name, **arguments)
+
+    strategy_classes = get_strategy_classes()
+    if name not in strategy_classes:
+        raise ValueError(f'Unknown strategy "{name}", the strategies are: {", ".join(strategy_classes)}')
+    return strategy_classes[name](**arguments)
+
+
+def create_tournament(config: dict, metrics: Metrics = None, recorder: ResultsRecorder = None,
+                      trace: TraceWriter = None):
+    strategies = [create_strategy(spec) for spec in config['strategies']]
+    tournament_config = dict(config['tournament'])
+    # The seed may also be in the tournament section, the config's seed (or --seed) comes first
+    seed = tournament_config.pop('seed', None)
+    if config.get('seed') is not None:
+        seed = config['seed']
+    return Tournament(strategies=strategies,
+                      seed=seed,
+                      metrics=metrics,
+                      recorder=recorder,
+                      trace=trace,
+                      **tournament_config)
+
+
+def create_trace(trace_config, directory: str, append: bool = False):
+    """The trace writer of the output's trace config: true to trace every game,
+    or a dict of the filters of TraceWriter (players, pairs, games).
+    A resumed run appends to the trace (games played after the last checkpoint appear again)"""
+    if not trace_config:
+        return None
+    filters = trace_config if isinstance(trace_config, dict) else {}
+    return TraceWriter(os.path.join(directory, 'trace.jsonl'), append=append, **filters)
+
+
+def report_throughput(metrics: Metrics, seconds: float, file=sys.stdout):
+    counters = metrics.to_dict()
+    generations_seconds = counters['generations_seconds']
+
+    print(f'Generations: {len(generations_seconds)} in {seconds:.2f} s', file=file)
+    if generations_seconds:
+        print(f'Seconds per generation: {sum(generations_seconds) / len(generations_seconds):.3f}', file=file)
+    print(f'Games played: {counters["games"]:,} ({counters["rounds"]:,} rounds)', file=file)
+    if counters['games_per_second']:
+        print(f'Throughput: {counters["games_per_second"]:,.0f} games/s, '
+              f'{counters["rounds_per_second"]:,.0f} rounds/s', file=file)
+
+
+def run(config: dict):
+    """
+    Run the generations of a config, writing its outputs to the config's output directory.
+
+    The config has the sections:
+    strategies - a list of strategies (see create_strategy),
+    tournament - the arguments of Tournament,
+    run - generations, checkpoint_every and the options of Tournament.run
+             (backend, batch_size, workers, chunk_size, concurrency, move_timeout),
+    output - directory (default 'output'), record_results (default False) and trace (see create_trace),
+    and the seed (or tournament.seed).
+
+    Returns:
+    Tournament: The tournament, after the last generation.
+    """
+    run_config = config.get('run', {})
+    output_config = config.get('output', {})
+
+    directory = output_config.get('directory', 'output')
+    os.makedirs(directory, exist_ok=True)
+
+    generations = run_config.get('generations', 1)
+    checkpoint_every = run_config.get('checkpoint_every')
+    checkpoint_path = os.path.join(directory, 'checkpoint.npz') if checkpoint_every else None
+    run_options = {key: run_config[key] for key in RUN_OPTIONS if key in run_config}
+
+    resuming = checkpoint_path is not None and os.path.exists(checkpoint_path)
+    if resuming:
+        print(f'Resuming from {checkpoint_path}')
+
+    metrics = Metrics()
+    recorder = ResultsRecorder(os.path.join(directory, 'results')) if output_config.get('record_results') else None
+    trace = create_trace(output_config.get('trace'), directory, append=resuming)
+    tournament = create_tournament(config, metrics, recorder, trace)
+
+    start = time.perf_counter()
+    try:
+        tournament.run_generations(generations, checkpoint_path=checkpoint_path,
+                                   checkpoint_every=checkpoint_every or generations, **run_options)
+    finally:
+        # Also reported when the run is interrupted
+        seconds = time.perf_counter() - start
+        if recorder is not None:
+            recorder.close()
+        if trace is not None:
+            trace.close()
+
+        with open(os.path.join(directory, 'history.json'), 'w') as file:
+            json.dump(tournament.history + [tournament.get_strategies_counter()], file, indent=2)
+        metrics.to_json(os.path.join(directory, 'metrics.json'))
+
+        report_throughput(metrics, seconds)
+
+    return tournament
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog='prisoners-dilemma', description="Prisoner's dilemma tournaments")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the generations of a config file')
+    run_parser.add_argument('config', help='YAML (or .json) config file')
+    run_parser.add_argument('--backend', choices=['serial', 'vectorized', 'process', 'async'], help='Overrides run.backend')
+    run_parser.add_argument('--workers', type=int, help='Overrides run.workers')
+    run_parser.add_argument('--generations', type=int, help='Overrides run.generations')
+    run_parser.add_argument('--seed', type=int, help='Overrides seed')
+    run_parser.add_argument('--output', help='Overrides output.directory')
+
+    commands.add_parser('strategies', help='List the strategies and their arguments')
+
+    trace_parser = commands.add_parser('trace', help='Show a trace file in two columns, like a debugged game')
+    trace_parser.add_argument('path', help='JSON Lines trace file')
+    trace_parser.add_argument('--game', help='Show only this game')
+    trace_parser.add_argument('--list', action='store_true', help='List the traced games instead')
+
+    arguments = parser.parse_args(arguments)
+
+    if arguments.command == 'strategies':
+        for name, strategy_class in get_strategy_classes().items():
+            print(f'{name}{inspect.signature(strategy_class)}')
+        return
+
+    if arguments.command == 'trace':
+        _trace.show_trace(arguments.path, arguments.game, arguments.list)
+        return
+
+    config = load_config(arguments.config)
+    run_config = config.setdefault('run', {})
+    output_config = config.setdefault('output', {})
+    for key in ('backend', 'workers', 'generations'):
+        if getattr(arguments, key) is not None:
+            run_config[key] = getattr(arguments, key)
+    if arguments.seed is not None:
+        config['seed'] = arguments.seed
+    if arguments.output is not None:
+        output_config['directory'] = arguments.output
+
+    run(config)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+from modules.payoff_matrix import compute_payoff_matrix
+from modules.strategies.strategies import *
+import numpy as np
+
+
+def get_payoffs(payoff_matrix):
+    """The means of a PayoffMatrix, or the given array of means"""
+    if not isinstance(payoff_matrix, np.ndarray):
+        payoff_matrix = payoff_matrix.mean
+    return np.asarray(payoff_matrix, dtype=np.float64)
+
+
+class ReplicatorDynamics:
+    """Continuous replicator dynamics of strategy frequencies in an infinite population:
+    dx_i/dt = x_i * (f_i - mean f), where f = payoffs @ x.
+
+    Integrated with Euler steps on payoffs rescaled to [0, 1]. Rescaling only changes
+    the speed of the dynamics, not their trajectories or fixed points.
+    Many populations can be evolved at once by giving a (populations, strategies) matrix of frequencies."""
+
+    def __init__(self, payoff_matrix, frequencies, time_step: float = 0.1):
+        """
+        Initialize the dynamics.
+
+        Parameters:
+        payoff_matrix (PayoffMatrix or np.ndarray): Average score of the row strategy against the column strategy.
+        frequencies (np.ndarray): (strategies,) or (populations, strategies) initial frequencies (normalized here).
+        time_step (float): The time of an Euler step.
+
+        Returns:
+        None
+        """
+        payoffs = get_payoffs(payoff_matrix)
+        payoffs_range = payoffs.max() - payoffs.min()
+        self.payoffs = (payoffs - payoffs.min()) / (payoffs_range if payoffs_range else 1)
+
+        frequencies = np.array(frequencies, dtype=np.float64)
+        self.single = frequencies.ndim == 1
+        self.frequencies = np.atleast_2d(frequencies)
+        self.frequencies /= self.frequencies.sum(axis=1, keepdims=True)
+
+        self.time_step = time_step
+        self.generation = 0
+
+    def __repr__(self):
+        return f'ReplicatorDynamics [{len(self.frequencies)} populations, generation {self.generation}]'
+
+    def step(self):
+        fitness = self.frequencies @ self.payoffs.T
+        average_fitness = (fitness * self.frequencies).sum(axis=1, keepdims=True)
+        self.frequencies += self.time_step * self.frequencies * (fitness - average_fitness)
+
+        # Euler steps can overshoot slightly below 0
+        np.clip(self.frequencies, 0, None, out=self.frequencies)
+        self.frequencies /= self.frequencies.sum(axis=1, keepdims=True)
+        self.generation += 1
+
+    def run(self, generations: int, record_every: int = 1):
+        """
+        Run the dynamics.
+
+        Parameters:
+        generations (int): Number of steps.
+        record_every (int): Steps between recorded frequencies.
+
+        Returns:
+        np.ndarray: The recorded frequencies (including the initial ones), (records, strategies)
+                    for a single population, (records, populations, strategies) for many.
+        """
+        history = [self.frequencies.copy()]
+        for generation in range(1, generations + 1):
+            self.step()
+            if generation % record_every == 0:
+                history.append(self.frequencies.copy())
+
+        history = np.array(history)
+        return history[:, 0] if self.single else history
+
+
+class MoranProcess:
+    """Stochastic Moran process in a finite population of strategy counts.
+
+    In every step one individual reproduces, chosen proportionally to count * exp(selection_intensity * payoff),
+    where its payoff is its average score against all the other individuals, and one individual, chosen
+    uniformly, dies. With mutation_rate the offspring is of a uniformly random strategy instead.
+    A generation is population size steps.
+    Many populations (e.g. replicas for fixation probabilities) are evolved at once by giving
+    a (populations, strategies) matrix of counts."""
+
+    def __init__(self, payoff_matrix, counts, selection_intensity: float = 0.1,
+                 mutation_rate: float = 0.0, seed: int = None):
+        """
+        Initialize the process.
+
+        Parameters:
+        payoff_matrix (PayoffMatrix or np.ndarray): Average score of the row strategy against the column strategy.
+        counts (np.ndarray): (strategies,) or (populations, strategies) number of individuals of every strategy,
+                             all the populations must have the same size.
+        selection_intensity (float): 0 for neutral drift, higher for stronger selection.
+        mutation_rate (float): Probability of an offspring being of a random strategy.
+        seed (int): Seed of the process.
+
+        Returns:
+        None
+        """
+        self.payoffs = get_payoffs(payoff_matrix)
+
+        counts = np.array(counts, dtype=np.int64)
+        self.single = counts.ndim == 1
+        self.counts = np.atleast_2d(counts)
+
+        population_sizes = self.counts.sum(axis=1)
+        if (population_sizes != population_sizes[0]).any():
+            raise ValueError('All the populations must have the same size')
+        self.population_size = int(population_sizes[0])
+        if self.population_size < 2:
+            raise ValueError('A population needs at least 2 individuals')
+
+        self.selection_intensity = selection_intensity
+        self.mutation_rate = mutation_rate
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
+
+    def __repr__(self):
+        return f'MoranProcess [{len(self.counts)} populations of {self.population_size}, ' \
+               f'generation {self.generation}]'
+
+    def get_fitness(self):
+        # Average score against everyone else (an individual doesn't play itself)
+        payoffs = (self.counts @ self.payoffs.T - np.diag(self.payoffs)) / (self.population_size - 1)
+        return np.exp(self.selection_intensity * payoffs)
+
+    def choose(self, weights):
+        """Choose a strategy in every population, proportionally to the weights"""
+        cumulative = np.cumsum(weights, axis=1)
+        thresholds = self.rng.random(len(weights)) * cumulative[:, -1]
+        return (cumulative <= thresholds[:, None]).sum(axis=1)
+
+    def step(self):
+        populations = np.arange(len(self.counts))
+
+        born = self.choose(self.counts * self.get_fitness())
+        if self.mutation_rate:
+            mutants = self.rng.random(len(self.counts)) < self.mutation_rate
+            born[mutants] = self.rng.integers(self.counts.shape[1], size=mutants.sum())
+        died = self.choose(self.counts)
+
+        self.counts[populations, born] += 1
+        self.counts[populations, died] -= 1
+
+    def run_generation(self):
+        for _ in range(self.population_size):
+            self.step()
+        self.generation += 1
+
+    def run(self, generations: int, record_every: int = 1):
+        """
+        Run the process.
+
+        Parameters:
+        generations (int): Number of generations (population size steps each).
+        record_every (int): Generations between recorded counts.
+
+        Returns:
+        np.ndarray: The recorded counts (including the initial ones), (records, strategies)
+                    for a single population, (records, populations, strategies) for many.
+        """
+        history = [self.counts.copy()]
+        for generation in range(1, generations + 1):
+            self.run_generation()
+            if generation % record_every == 0:
+                history.append(self.counts.copy())
+
+        history = np.array(history)
+        return history[:, 0] if self.single else history
+
+    def get_fixations(self):
+        """The strategy that took over every population, -1 where none did yet"""
+        fixed = self.counts.max(axis=1) == self.population_size
+        fixations = np.where(fixed, self.counts.argmax(axis=1), -1)
+        return fixations[0] if self.single else fixations
+
+
+if __name__ == '__main__':
+    evolution_strategies = [
+        GoodyTwoShoes(),
+        Cheater(),
+        CopyKitten(defined_limit=2, start_with=1),
+        Forgiver(grudge_limit=2, copy_kitten_limit=2, copy_kitten_start_with=1),
+    ]
+
+    payoff_matrix = compute_payoff_matrix(strategies=evolution_strategies,
+                                          rounds=100,
+                                          mistake_chance=0.05,
+                                          repetitions=20,
+                                          seed=0)
+
+    replicator = ReplicatorDynamics(payoff_matrix, frequencies=[1] * len(evolution_strategies))
+    frequencies = replicator.run(generations=100000, record_every=10000)
+    for generation, generation_frequencies in zip(range(0, 100001, 10000), frequencies):
+        print(f'Replicator generation #{generation}: {np.round(generation_frequencies, 3)}')
+
+    # Fixation of a single Forgiver among Cheaters, in 1000 replicas
+    counts = np.zeros((1000, len(evolution_strategies)), dtype=np.int64)
+    counts[:, 1] = 49
+    counts[:, 3] = 1
+    moran = MoranProcess(payoff_matrix, counts, selection_intensity=0.05, seed=0)
+    moran.run(generations=200, record_every=200)
+    fixations = moran.get_fixations()
+    print(f'Forgiver fixation probability: {np.mean(fixations == 3):.3f} (neutral: {1 / 50:.3f})')
@@ -0,0 +1,72 @@
+from modules.tournament import Tournament
+from modules.strategies.strategies import *
+import argparse
+import json
+import time
+
+
+def run_headless(tournament: Tournament, generations: int, **run_options):
+    """
+    Run the generations of a tournament, without anything graphical.
+
+    Parameters:
+    tournament (Tournament): The tournament to run.
+    generations (int): The generation to stop at (the total number of generations).
+    run_options: Passed to Tournament.run_generations (e.g. backend, checkpoint_path).
+
+    Returns:
+    list: The strategies counter before every generation and after the last one.
+    """
+    tournament.run_generations(generations, **run_options)
+    return tournament.history + [tournament.get_strategies_counter()]
+
+
+def get_default_strategies():
+    return [
+        GoodyTwoShoes(),
+        Cheater(),
+        Joker(threshold_to_cooperate=0.5),
+        CopyKitten(defined_limit=2, start_with=1),
+        Businessman(random_actions=4, kindness_limit=0, copy_kitten_limit=2, copy_kitten_start_with=1),
+        Alternator(alternate_after=2, start_with=1),
+        Forgiver(grudge_limit=2, copy_kitten_limit=2, copy_kitten_start_with=1),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a tournament of the default strategies without plotting '
+                                                 '(pandas and matplotlib are never imported)')
+    parser.add_argument('--generations', type=int, default=5)
+    parser.add_argument('--copies', type=int, default=5, help='Copies of each strategy')
+    parser.add_argument('--rounds', type=int, default=100, help='Rounds per game')
+    parser.add_argument('--mistake-chance', type=float, default=0.05)
+    parser.add_argument('--backend', default='serial', choices=['serial', 'vectorized', 'process'])
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', help='JSON file for the strategies counters of the generations')
+    arguments = parser.parse_args()
+
+    tournament = Tournament(strategies=get_default_strategies(),
+                            copies_of_each_strategy=arguments.copies,
+                            rounds_per_game=arguments.rounds,
+                            games_between_players=2,
+                            initial_player_score=100,
+                            top_percentage=0.8,
+                            mistake_chance=arguments.mistake_chance,
+                            survival_bias=0.1,
+                            seed=arguments.seed)
+
+    start = time.perf_counter()
+    history = run_headless(tournament, arguments.generations, backend=arguments.backend)
+    seconds = time.perf_counter() - start
+
+    for generation, strategies_counter in enumerate(history):
+        print(f'Generation #{generation}: {strategies_counter}')
+    print(f'{arguments.generations} generations in {seconds:.2f} seconds')
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(history, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from modules._player import Player
+from modules._game import Game
+from modules._vectorized_game import VectorizedGames
+from modules._random_stream import RandomStream
+from modules._payoff import Payoff
+from modules.strategies.strategies import *
+import numpy as np
+import hashlib
+import json
+import os
+
+
+class PayoffMatrix:
+    """The expected score of every strategy in a game against every strategy.
+
+    mean[a, b] is the average score change of strategy a in a game against strategy b,
+    std[a, b] its sample standard deviation and samples[a, b] the number of games it was averaged over."""
+
+    def __init__(self, strategies: List[str], mean: np.ndarray, std: np.ndarray, samples: np.ndarray,
+                 confidence: float = 0.95):
+        """
+        Initialize the matrix.
+
+        Parameters:
+        strategies (list): The names of the strategies, in the order of the rows and columns.
+        mean (np.ndarray): (strategies, strategies) average scores.
+        std (np.ndarray): (strategies, strategies) sample standard deviations of the scores.
+        samples (np.ndarray): (strategies, strategies) number of scores in every average.
+        confidence (float): Confidence level of the intervals.
+
+        Returns:
+        None
+        """
+        self.strategies = strategies
+        self.mean = mean
+        self.std = std
+        self.samples = samples
+        self.confidence = confidence
+
+    def __repr__(self):
+        return f'PayoffMatrix [{len(self.strategies)} strategies, {int(self.samples.min())}+ samples]'
+
+    @property
+    def half_width(self):
+        """Half the width of the confidence interval of every average (normal approximation)"""
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        return z * self.std / np.sqrt(self.samples)
+
+    @property
+    def low(self):
+        return self.mean - self.half_width
+
+    @property
+    def high(self):
+        return self.mean + self.half_width
+
+    def to_table(self):
+        """The averages and confidence intervals as text, a line per pair of strategies"""
+        lines = []
+        half_width = self.half_width
+        for a, strategy_a in enumerate(self.strategies):
+            for b, strategy_b in enumerate(self.strategies):
+                lines.append(f'{strategy_a} vs. {strategy_b}: '
+                             f'{self.mean[a, b]:.2f} ± {half_width[a, b]:.2f}')
+        return '\n'.join(lines)
+
+    def save(self, path: str):
+        with open(path, 'wb') as file:
+            np.savez(file, strategies=np.array(self.strategies), mean=self.mean, std=self.std,
+                     samples=self.samples, confidence=self.confidence)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(strategies=arrays['strategies'].tolist(),
+                       mean=arrays['mean'],
+                       std=arrays['std'],
+                       samples=arrays['samples'],
+                       confidence=float(arrays['confidence']))
+
+
+def play_payoff_games(strategies: List[Strategy], rounds: int, mistake_chance: float,
+                      repetitions: int, seed, payoff: Payoff = None):
+    """
+    Play every ordered pair of strategies repetitions times, and sum the scores.
+
+    Parameters:
+    strategies (list): The strategies to play.
+    rounds (int): Number of rounds in every game.
+    mistake_chance (float): Probability of every single action being flipped.
+    repetitions (int): Number of games between every ordered pair of strategies.
+    seed: Seed of the random generator of the games.
+    payoff (Payoff): The scores of a round, the default donation game when None.
+
+    Returns:
+    tuple: (totals, squares, samples) (strategies, strategies) matrices of the sums of the scores
+           of the row strategy against the column strategy, of their squares, and their number.
+    """
+    rng = np.random.default_rng(seed)
+    stream = RandomStream(rng)
+
+    strategies_count = len(strategies)
+    totals = np.zeros((strategies_count, strategies_count))
+    squares = np.zeros((strategies_count, strategies_count))
+    samples = np.zeros((strategies_count, strategies_count), dtype=np.int64)
+
+    def add(firsts, seconds, scores_1, scores_2):
+        # Each game is a sample for both sides
+        for rows, columns, scores in ((firsts, seconds, scores_1), (seconds, firsts, scores_2)):
+            np.add.at(totals, (rows, columns), scores)
+            np.add.at(squares, (rows, columns), np.square(scores, dtype=np.float64))
+            np.add.at(samples, (rows, columns), 1)
+
+    pairs = [(a, b) for a in range(strategies_count) for b in range(strategies_count)]
+    vectorized_pairs = [(a, b) for a, b in pairs if strategies[a].vectorized and strategies[b].vectorized]
+    other_pairs = [(a, b) for a, b in pairs if not (strategies[a].vectorized and strategies[b].vectorized)]
+
+    if vectorized_pairs and repetitions:
+        firsts, seconds = np.array(vectorized_pairs * repetitions).T
+        games = VectorizedGames(strategies_1=[strategies[a] for a in firsts],
+                                strategies_2=[strategies[b] for b in seconds],
+                                rounds=rounds,
+                                rng=rng,
+                                payoff=payoff)
+        add(firsts, seconds, *games.run(mistake_chance=mistake_chance))
+
+    if other_pairs and repetitions:
+        firsts, seconds = np.array(other_pairs * repetitions).T
+        scores = np.empty((2, len(firsts)), dtype=Payoff.from_config(payoff).dtype)
+        for game_index, (a, b) in enumerate(zip(firsts, seconds)):
+            game = Game(player_1=Player(name='1', strategy=strategies[a], initial_score=0),
+                        player_2=Player(name='2', strategy=strategies[b], initial_score=0),
+                        name=f'{strategies[a].name} vs. {strategies[b].name}',
+                        rounds=rounds,
+                        rng=stream,
+                        payoff=payoff)
+            scores[:, game_index] = game.run(mistake_chance=mistake_chance)
+        add(firsts, seconds, *scores)
+
+    return totals, squares, samples
+
+
+def get_cache_key(strategies, rounds, mistake_chance, repetitions, seed, payoff: Payoff = None):
+    description = {
+        'strategies': [str(strategy) for strategy in strategies],
+        'rounds': rounds,
+        'mistake_chance': mistake_chance,
+        'repetitions': repetitions,
+        'seed': seed,
+        'payoff': Payoff.from_config(payoff).to_dict(),
+    }
+    return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+def compute_payoff_matrix(strategies: List[Strategy], rounds: int, mistake_chance: float,
+                          repetitions: int = 10, seed: int = None, confidence: float = 0.95,
+                          workers: int = None, cache_directory: str = None, payoff: Payoff = None):
+    """
+    Play every strategy against every strategy and average the scores.
+
+    Parameters:
+    strategies (list): The strategies to play.
+    rounds (int): Number of rounds in every game.
+    mistake_chance (float): Probability of every single action being flipped.
+    repetitions (int): Number of games between every ordered pair of strategies.
+    seed (int): Seed of the games.
+    confidence (float): Confidence level of the intervals.
+    workers (int): Number of processes to split the repetitions between, None to play them in this process.
+    cache_directory (str): Directory to keep the computed matrices in, None for no cache.
+                           Only matrices computed with a seed are cached.
+    payoff (Payoff): The scores of a round (or its config, see Payoff.from_config), the default donation game when None.
+
+    Returns:
+    PayoffMatrix: The matrix of the averages and their confidence intervals.
+    """
+    payoff = Payoff.from_config(payoff)
+
+    cache_path = None
+    if cache_directory is not None and seed is not None:
+        key = get_cache_key(strategies, rounds, mistake_chance, repetitions, seed, payoff)
+        cache_path = os.path.join(cache_directory, f'payoffs_{key}.npz')
+        if os.path.exists(cache_path):
+            matrix = PayoffMatrix.load(cache_path)
+            matrix.confidence = confidence
+            return matrix
+
+    if workers is None:
+        totals, squares, samples = play_payoff_games(strategies, rounds, mistake_chance, repetitions, seed, payoff)
+    else:
+        # Every worker plays a share of the repetitions with its own seed
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        shares = [len(share) for share in np.array_split(np.arange(repetitions), workers)]
+
+        totals = squares = samples = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(play_payoff_games, strategies, rounds, mistake_chance, share, share_seed, payoff)
+                       for share, share_seed in zip(shares, seeds) if share > 0]
+            for future in futures:
+                share_totals, share_squares, share_samples = future.result()
+                totals = totals + share_totals
+                squares = squares + share_squares
+                samples = samples + share_samples
+
+    mean = totals / samples
+    variance = (squares - samples * mean ** 2) / np.maximum(samples - 1, 1)
+    std = np.sqrt(np.maximum(variance, 0))
+
+    matrix = PayoffMatrix(strategies=[str(strategy) for strategy in strategies],
+                          mean=mean, std=std, samples=samples, confidence=confidence)
+
+    if cache_path is not None:
+        os.makedirs(cache_directory, exist_ok=True)
+        matrix.save(cache_path)
+
+    return matrix
+
+
+if __name__ == '__main__':
+    matrix_strategies = [
+        GoodyTwoShoes(),
+        Cheater(),
+        Joker(threshold_to_cooperate=0.5),
+        CopyKitten(defined_limit=2, start_with=1),
+        Businessman(random_actions=4, kindness_limit=0, copy_kitten_limit=2, copy_kitten_start_with=1),
+        Forgiver(grudge_limit=2, copy_kitten_limit=2, copy_kitten_start_with=1),
+    ]
+
+    payoff_matrix = compute_payoff_matrix(strategies=matrix_strategies,
+                                          rounds=100,
+                                          mistake_chance=0.05,
+                                          repetitions=50,
+                                          seed=0,
+                                          workers=4)
+
+    print(payoff_matrix.to_table())
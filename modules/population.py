@@ -0,0 +1,117 @@
+from typing import List
+from modules.payoff_matrix import compute_payoff_matrix
+from modules.strategies.strategies import *
+import numpy as np
+import math
+
+
+class Population:
+    """A population stored as the number of individuals of every strategy,
+    instead of one Player per individual.
+
+    Every individual plays every individual (itself included), games_between_players times
+    in both orders, like a Tournament with the default pairings. The score of an individual
+    is its expected score, computed from a strategy-vs-strategy payoff matrix,
+    so a generation costs O(strategies²) instead of O(players²) games."""
+
+    def __init__(self, strategies: List[Strategy],
+                 counts,
+                 rounds_per_game: int,
+                 games_between_players: int,
+                 initial_player_score: int,
+                 top_percentage: float,
+                 mistake_chance: float,
+                 payoff_matrix: np.ndarray = None,
+                 repetitions: int = 10,
+                 seed: int = None,
+                 payoff=None):
+        """
+        Initialize the population.
+
+        Parameters:
+        strategies (list): The strategies, a strategy's index is its id.
+        counts (list): Number of individuals of every strategy.
+        payoff_matrix (PayoffMatrix or np.ndarray): Precomputed payoff matrix of the strategies (or its means),
+                                                    computed here (with the given repetitions) when None.
+        payoff (Payoff): The scores of a round (or its config), to compute the payoff matrix with.
+        Other parameters are the same as Tournament's.
+
+        Returns:
+        None
+        """
+        if len(strategies) != len(counts):
+            raise ValueError('Every strategy needs a count')
+
+        self.strategies = strategies
+        self.counts = np.array(counts, dtype=np.int64)
+        self.rounds_per_game = rounds_per_game
+        self.games_between_players = games_between_players
+        self.initial_player_score = initial_player_score
+        self.top_percentage = top_percentage
+        self.mistake_chance = mistake_chance
+        self.generation = 0
+
+        if payoff_matrix is None:
+            payoff_matrix = compute_payoff_matrix(strategies, rounds_per_game, mistake_chance,
+                                                  repetitions=repetitions, seed=seed, payoff=payoff)
+        if not isinstance(payoff_matrix, np.ndarray):
+            payoff_matrix = payoff_matrix.mean
+        self.payoff_matrix = payoff_matrix
+
+        self.total_players = int(self.counts.sum())
+
+    def get_fitness(self):
+        """Expected score of an individual of every strategy, after playing the whole population"""
+        # Once as the first player and once as the second against everyone
+        return self.initial_player_score + \
+            2 * self.games_between_players * (self.payoff_matrix @ self.counts)
+
+    def next_generation(self):
+        """Keep the top individuals and multiply them proportionally to their scores,
+        like Tournament.multiply_top_players"""
+        fitness = self.get_fitness()
+        order = np.argsort(-fitness, kind='stable')
+
+        # Keep the best top_count individuals, the last strategy kept may be cut
+        top_count = math.ceil(self.total_players * self.top_percentage)
+        ordered_counts = self.counts[order]
+        kept_before = np.cumsum(ordered_counts) - ordered_counts
+        survivors = np.zeros_like(self.counts)
+        survivors[order] = np.clip(top_count - kept_before, 0, ordered_counts)
+
+        weights = survivors * fitness
+        amounts = np.round(self.total_players * weights / weights.sum()).astype(np.int64)
+
+        # The rounding leftovers go to the weakest survivors, like to the last player in a Tournament
+        weakest = order[survivors[order] > 0][-1]
+        amounts[weakest] += self.total_players - amounts.sum()
+
+        self.counts = amounts
+        self.generation += 1
+
+    def get_strategies_counter(self):
+        return {str(strategy): int(count) for strategy, count in zip(self.strategies, self.counts) if count > 0}
+
+
+if __name__ == '__main__':
+    population_strategies = [
+        GoodyTwoShoes(),
+        Cheater(),
+        Joker(threshold_to_cooperate=0.5),
+        CopyKitten(defined_limit=2, start_with=1),
+        Businessman(random_actions=4, kindness_limit=0, copy_kitten_limit=2, copy_kitten_start_with=1),
+        Alternator(alternate_after=2, start_with=1),
+        Forgiver(grudge_limit=2, copy_kitten_limit=2, copy_kitten_start_with=1),
+    ]
+
+    population = Population(strategies=population_strategies,
+                            counts=[100000] * len(population_strategies),
+                            rounds_per_game=100,
+                            games_between_players=2,
+                            initial_player_score=100,
+                            top_percentage=0.8,
+                            mistake_chance=0.05)
+
+    for generation in range(20):
+        print(f'Generation #{generation + 1}: {population.get_strategies_counter()}')
+        population.next_generation()
@@ -1,60 +1,127 @@
-from modules._strategy import Strategy
-import random
+from modules._strategy import Strategy, Memory
+import numpy as np
+
+
+# Thoughts of the strategies that start with a given or random action
+_START_THOUGHTS = {
+    'start_random': "I start randomly",
+    'start_fixed': "I start with a fixed action",
+}
+
+
+def _start_action(start_with, memory):
+    """Starting action: start_with, or random when start_with is None"""
+    if start_with is None:
+        memory.reason = 'start_random'
+        return memory.rng.coin()
+    memory.reason = 'start_fixed'
+    return start_with
+
+
+def _start_actions(start_with, games, rng):
+    """Vectorized starting actions: start_with for every game, or random when start_with is None"""
+    if start_with is None:
+        return rng.integers(0, 2, games, dtype=np.int8)
+    return np.full(games, start_with, dtype=np.int8)
 
 
 class GoodyTwoShoes(Strategy):
     """Always cooperate"""
 
+    vectorized = True
+    deterministic = True
+
+    thoughts = {None: "I always cooperate"}
+
     def __init__(self):
         super().__init__('GoodyTwoShoes')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    def get_action(self, self_moves, opponent_moves, memory):
         """Always cooperates."""
-        return 1, "I always cooperate"
+        return 1
+
+    def get_state_key(self, memory):
+        return ()
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        return np.ones(len(self_moves), dtype=np.int8)
 
 
 class Cheater(Strategy):
     """Always cheat"""
 
+    vectorized = True
+    deterministic = True
+
+    thoughts = {None: "I always cheat"}
+
     def __init__(self):
         super().__init__('Cheater')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    def get_action(self, self_moves, opponent_moves, memory):
         """Always defects."""
-        return 0, "I always cheat"
+        return 0
+
+    def get_state_key(self, memory):
+        return ()
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        return np.zeros(len(self_moves), dtype=np.int8)
 
 
 class Joker(Strategy):
     """Random behavior depending on some threshold"""
 
+    vectorized = True
+
+    thoughts = {None: "I am crazy!"}
+
     def __init__(self, threshold_to_cooperate: float = 0.5):
         self.threshold = threshold_to_cooperate
         super().__init__('Joker')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    def get_action(self, self_moves, opponent_moves, memory):
         """Randomly cooperates or defects based on a threshold."""
-        if random.random() > self.threshold:
-            return 1, "I am crazy!"
-        return 0, "I am crazy!"
+        if memory.rng.random() > self.threshold:
+            return 1
+        return 0
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        return (rng.random(len(self_moves)) > self.threshold).astype(np.int8)
 
 
 class CopyCat(Strategy):
     """Starts by a given action,
     then imitates opponent"""
 
+    vectorized = True
+
+    thoughts = {**_START_THOUGHTS, 'copy': "I copy you"}
+
     def __init__(self, start_with):
         self.start_with = start_with
         self.start_with_random = start_with is None
         super().__init__('CopyCat')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
-        if len(self_moves) == 0:
+    @property
+    def deterministic(self):
+        return not self.start_with_random
+
+    def get_action(self, self_moves, opponent_moves, memory):
+        if memory.rounds_played == 0:
             # If no previous moves, start with the specified action or randomly
-            thought = "I start randomly" if self.start_with_random else f"I start with a fixed action"
-            action = random.randint(0, 1) if self.start_with_random else self.start_with
-            return action, thought
+            return _start_action(self.start_with, memory)
         else:
-            return opponent_moves[-1], "I copy you"
+            memory.reason = 'copy'
+            return memory.opponent_last_action
+
+    def get_state_key(self, memory):
+        return memory.rounds_played > 0, memory.opponent_last_action
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        if self_moves.shape[1] == 0:
+            return _start_actions(self.start_with, len(self_moves), rng)
+        return opponent_moves[:, -1]
 
 
 class CopyKitten(Strategy):
@@ -64,38 +131,75 @@ class CopyKitten(Strategy):
     cooperate, consistently).
     When defined_limit = 1, this strategy is identical to CopyCat"""
 
+    vectorized = True
+
+    thoughts = {
+        **_START_THOUGHTS,
+        'cheat_back': "I was cooperating, but you cheated too many times",
+        'cooperate_back': "I was cheating, but you cooperated enough times",
+        'keep': "I keep going as before",
+    }
+
     def __init__(self, defined_limit, start_with):
         self.limit = defined_limit
         self.start_with_random = start_with is None
         self.start_with = start_with
         super().__init__('CopyKitten')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    @property
+    def deterministic(self):
+        return not self.start_with_random
+
+    def get_action(self, self_moves, opponent_moves, memory):
         limit = self.limit
 
         # Check if we're still in the initial phase of cooperating
-        if len(self_moves) < limit:
+        if memory.rounds_played < limit:
             # If no previous moves, start with the specified action or randomly
-            thought = "I start randomly" if self.start_with_random else f"I start with a fixed action"
-            action = random.randint(0, 1) if self.start_with_random else self.start_with
-            return action, thought
+            return _start_action(self.start_with, memory)
         else:
-            my_last_action = self_moves[-1]
-            sum_of_last_n_opponent_actions = sum(opponent_moves[-limit:])
+            my_last_action = memory.my_last_action
+
+            # The last n opponent actions were all the same as their last one
+            consistent_opponent = memory.opponent_streak >= limit
+            opponent_last_action = memory.opponent_last_action
 
             # Check if opponent's recent actions indicate consistent defection
-            if my_last_action == 1 and sum_of_last_n_opponent_actions == 0:
+            if my_last_action == 1 and consistent_opponent and opponent_last_action == 0:
                 # I was cooperating, but opponent cheated too many times and now I'll cheat
-                return 0, "I was cooperating, but you cheated too many times"
+                memory.reason = 'cheat_back'
+                return 0
 
             # Check if opponent's recent actions indicate consistent cooperation
-            elif my_last_action == 0 and sum_of_last_n_opponent_actions == limit:
+            elif my_last_action == 0 and consistent_opponent and opponent_last_action == 1:
                 # I was cheating, but opponent cooperated enough times for me to cooperate
-                return 1, "I was cheating, but you cooperated enough times"
+                memory.reason = 'cooperate_back'
+                return 1
 
             else:
                 # No consistent pattern detected, continue as before
-                return my_last_action, "I keep going as before"
+                memory.reason = 'keep'
+                return my_last_action
+
+    def get_state_key(self, memory):
+        # Counts beyond the limit don't change anything
+        limit = self.limit
+        return (min(memory.rounds_played, limit), memory.my_last_action,
+                memory.opponent_last_action, min(memory.opponent_streak, limit))
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        limit = self.limit
+
+        if self_moves.shape[1] < limit:
+            return _start_actions(self.start_with, len(self_moves), rng)
+
+        my_last_actions = self_moves[:, -1]
+        sums_of_last_n_opponent_actions = opponent_moves[:, -limit:].sum(axis=1)
+
+        actions = my_last_actions.copy()
+        actions[(my_last_actions == 1) & (sums_of_last_n_opponent_actions == 0)] = 0
+        actions[(my_last_actions == 0) & (sums_of_last_n_opponent_actions == limit)] = 1
+        return actions
 
 
 class Grudger(Strategy):
@@ -103,19 +207,39 @@ class Grudger(Strategy):
     but once you cheat me more times than my limit,
     I'll never cooperate again. I'm also known as Grim Trigger"""
 
+    vectorized = True
+    deterministic = True
+
+    thoughts = {
+        'broken': "My limit was {strategy.limit} and you have broken my trust {memory.opponent_cheats} time(s)",
+        'trust': "You cheated me {memory.opponent_cheats}/{strategy.limit}, so I'll cooperate",
+    }
+
     def __init__(self, defined_limit: int = 2):
         self.limit = defined_limit
         super().__init__('Grudger')  # Changed 'Cowboy' to 'Grudger' for consistency
 
-    def get_recommended_action(self, self_moves, opponent_moves):
-        opponent_cheating_counter = sum([opponent_action == 0 for opponent_action in opponent_moves])
-
+    def get_action(self, self_moves, opponent_moves, memory):
         # Check if opponent has cheated more times than the defined limit
-        if opponent_cheating_counter >= self.limit:
-            return 0, f"My limit was {self.limit} and you have broken my trust {opponent_cheating_counter} time(s)"
+        if memory.opponent_cheats >= self.limit:
+            memory.reason = 'broken'
+            return 0
         else:
             # Cooperate if opponent hasn't reached the cheating limit
-            return 1, f"You cheated me {opponent_cheating_counter}/{self.limit}, so I'll cooperate"
+            memory.reason = 'trust'
+            return 1
+
+    def get_state_key(self, memory):
+        return min(memory.opponent_cheats, self.limit)
+
+    def new_vectorized_state(self, games):
+        # Running count of each opponent's cheating
+        return np.zeros(games, dtype=np.int64)
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        if opponent_moves.shape[1] > 0:
+            state += opponent_moves[:, -1] == 0
+        return (state < self.limit).astype(np.int8)
 
 
 class Businessman(Strategy):
@@ -128,6 +252,23 @@ class Businessman(Strategy):
     Otherwise, I'll assume you can retaliate and will from then on will
     behave like a CopyKitten(copy_kitten_limit)"""
 
+    class BusinessmanMemory(Memory):
+        __slots__ = ('forgiven_betrayals', 'copy_kitten_memory', 'behave_like_copy_kitten', 'they_are_suckers')
+
+        def __init__(self, rng=None):
+            super().__init__(rng)
+            self.forgiven_betrayals = 0  # Times the opponent cooperated right after I cheated
+            self.copy_kitten_memory = Memory(self.rng)  # What my CopyKitten sees, once I behave like it
+            self.behave_like_copy_kitten = False  # Flag to indicate CopyKitten behavior
+            self.they_are_suckers = False  # Flag to indicate assumption of opponent's kindness
+
+    memory_class = BusinessmanMemory
+
+    thoughts = {
+        'sucker': "I think you're a sucker, so I try to take advantage",
+        'test': "I test you with random actions",
+    }
+
     def __init__(self, random_actions: int = 2,
                  kindness_limit: float = 1.0,
                  copy_kitten_limit: int = 2,
@@ -140,70 +281,88 @@ class Businessman(Strategy):
         self.random_actions = random_actions  # Number of initial random actions
         self.kindness_limit = kindness_limit  # Forgiveness threshold for assuming opponent's kindness
         self.copy_kitten = CopyKitten(defined_limit=copy_kitten_limit, start_with=copy_kitten_start_with)  # CopyKitten strategy with specified limit
-        self.behave_like_copy_kitten = False  # Flag to indicate CopyKitten behavior
-        self.they_are_suckers = False  # Flag to indicate assumption of opponent's kindness
 
         super().__init__('Businessman')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    @property
+    def deterministic(self):
+        return self.copy_kitten.deterministic
+
+    def get_action(self, self_moves, opponent_moves, memory):
         # Check if we should act like CopyKitten due to opponent's kindness or retaliation capability
-        if self.they_are_suckers:
-            return 0, "I think you're a sucker, so I try to take advantage"
+        if memory.they_are_suckers:
+            memory.reason = 'sucker'
+            return 0
 
-        if self.behave_like_copy_kitten:
+        if memory.behave_like_copy_kitten:
             # Get the recommended action from the CopyKitten strategy
-            action, thought = self.copy_kitten.get_recommended_action(
-                self_moves=self_moves[self.random_actions + 1:],
-                opponent_moves=opponent_moves)
-
-            businessman_thought = "My kitten says: " + thought
-            return action, businessman_thought
+            memory.reason = 'kitten'
+            return self.copy_kitten.get_action(
+                self_moves=self_moves,
+                opponent_moves=opponent_moves,
+                memory=memory.copy_kitten_memory)
 
-        rounds_played = len(self_moves)
+        rounds_played = memory.rounds_played
 
         # Check if we are still in the random actions phase
         if rounds_played < self.random_actions:
-            return len(self_moves) % 2, "I test you with random actions"
+            memory.reason = 'test'
+            return rounds_played % 2
 
         elif rounds_played == self.random_actions:
             # Calculate the percentage of forgiven betrayals based on previous moves
-            forgiveness_percentage = self.calculate_forgiveness_percentage(self_moves, opponent_moves)
+            forgiveness_percentage = self.calculate_forgiveness_percentage(memory)
 
             if forgiveness_percentage >= self.kindness_limit:
                 # Assume opponent's kindness and exploit it
-                self.they_are_suckers = True
-                return self.get_recommended_action(self_moves, opponent_moves)
+                memory.they_are_suckers = True
+                return self.get_action(self_moves, opponent_moves, memory)
             else:
                 # Assume opponent's retaliation capability and act like CopyKitten
-                self.behave_like_copy_kitten = True
-                return self.get_recommended_action(self_moves, opponent_moves)
+                memory.behave_like_copy_kitten = True
+                return self.get_action(self_moves, opponent_moves, memory)
+
+    def get_state_key(self, memory):
+        if memory.they_are_suckers:
+            return 'sucker'
+        if memory.behave_like_copy_kitten:
+            # My CopyKitten starts observing a round after I decided
+            return ('kitten', min(memory.rounds_played, self.random_actions + 2),
+                    self.copy_kitten.get_state_key(memory.copy_kitten_memory))
+        return 'test', memory.rounds_played, memory.forgiven_betrayals, memory.my_last_action
+
+    def explain(self, memory):
+        if memory.reason == 'kitten':
+            return "My kitten says: " + self.copy_kitten.explain(memory.copy_kitten_memory)
+        return super().explain(memory)
+
+    def observe(self, memory, my_action, opponent_action):
+        # The opponent forgave my betrayal of the previous round
+        if memory.my_last_action == 0 and opponent_action == 1:
+            memory.forgiven_betrayals += 1
+
+        super().observe(memory, my_action, opponent_action)
+
+        # My CopyKitten only sees the rounds after my random actions and the round I decided in
+        if memory.rounds_played > self.random_actions + 1:
+            self.copy_kitten.observe(memory.copy_kitten_memory, my_action, opponent_action)
 
     @staticmethod
-    def calculate_forgiveness_percentage(self_moves, opponent_moves):
+    def calculate_forgiveness_percentage(memory):
         """Calculate the percentage of forgiven betrayals based on past moves.
 
         Parameters:
-        self_moves (list): List of the player's previous moves.
-        opponent_moves (list): List of the opponent's previous moves.
+        memory (BusinessmanMemory): The memory of the current game.
 
         Returns:
         float: Percentage of forgiven betrayals.
         """
 
-        # Exclude the last move of the player to align with opponent's moves
-        my_moves_without_last = self_moves[:-1]
-
-        # Exclude the first move of the opponent to align with player's moves
-        their_moves_without_first = opponent_moves[1:]
-
-        # Pair up the player's moves without the last one and the opponent's moves without the first one
-        zipped = zip(my_moves_without_last, their_moves_without_first)
-
-        # Count the number of times player forgave betrayal (0 to 1 transition)
-        forgiveness = sum([tup[0] == 0 and tup[1] == 1 for tup in zipped])
+        # Every move of mine except the last one could have been forgiven by the opponent's next move
+        forgiveness_opportunities = memory.rounds_played - 1
 
         # Calculate the percentage of forgiven betrayals relative to the total moves
-        forgiveness_percentage = forgiveness / len(my_moves_without_last)
+        forgiveness_percentage = memory.forgiven_betrayals / forgiveness_opportunities
 
         return forgiveness_percentage
 
@@ -212,6 +371,11 @@ class Sequential(Strategy):
     """I will repeat a defined sequence of cooperating and cheating
     Regardless of my opponents actions"""
 
+    vectorized = True
+    deterministic = True
+
+    thoughts = {None: "I just repeat my sequence"}
+
     def __init__(self, sequence):
         """
         Initialize the Sequential strategy.
@@ -225,29 +389,33 @@ class Sequential(Strategy):
         self.sequence = sequence
         super().__init__('Sequential')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    def get_action(self, self_moves, opponent_moves, memory):
         """
         Get the recommended action based on the defined sequence.
 
         Parameters:
-        self_moves (list): List of the player's previous moves.
-        opponent_moves (list): List of the opponent's previous moves.
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
 
         Returns:
-        tuple: (action, explanation) where action is the recommended action (0 or 1)
-               and explanation is a string explaining the decision.
+        int: The recommended action (0 or 1).
         """
         sequence_length = len(self.sequence)
-        action_number = len(self_moves)
+        action_number = memory.rounds_played
 
         # Calculate the index in the sequence based on the number of actions played
         mod = action_number % sequence_length
 
         # Get the action from the defined sequence based on the calculated index
-        action = self.sequence[mod]
+        return self.sequence[mod]
+
+    def get_state_key(self, memory):
+        return memory.rounds_played % len(self.sequence)
 
-        explanation = "I just repeat my sequence"
-        return action, explanation
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        action = self.sequence[self_moves.shape[1] % len(self.sequence)]
+        return np.full(len(self_moves), action, dtype=np.int8)
 
 
 class Alternator(Strategy):
@@ -255,6 +423,19 @@ class Alternator(Strategy):
     starting with a given action.
     Start_with can be 1, 0 or None (which means it's randomly chosen)"""
 
+    vectorized = True
+
+    class AlternatorMemory(Memory):
+        __slots__ = ('sequential',)
+
+        def __init__(self, rng=None):
+            super().__init__(rng)
+            self.sequential = None  # The alternating sequence of the current game
+
+    memory_class = AlternatorMemory
+
+    thoughts = Sequential.thoughts
+
     def __init__(self, alternate_after, start_with):
         """
         Initialize the Alternator strategy.
@@ -272,35 +453,62 @@ class Alternator(Strategy):
 
         self.alternate_after = alternate_after
 
-        self.sequential = None
+        # A random start gets its own sequence in every game
+        self.sequential = None if self.start_with_random else self.create_sequential(start_with)
 
         super().__init__('Alternator')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    @property
+    def deterministic(self):
+        return not self.start_with_random
+
+    def create_sequential(self, start_with):
+        other_element = 0 if start_with else 1
+
+        # Create the alternating sequence of actions
+        first_part = [start_with] * self.alternate_after
+        other_part = [other_element] * self.alternate_after
+        sequence = first_part + other_part
+
+        # Initialize a Sequential strategy using the alternating sequence
+        return Sequential(sequence=sequence)
+
+    def get_action(self, self_moves, opponent_moves, memory):
         """
         Get the recommended action based on the underlying Sequential strategy.
 
         Parameters:
-        self_moves (list): List of the player's previous moves.
-        opponent_moves (list): List of the opponent's previous moves.
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
 
         Returns:
-        tuple: (action, explanation) where action is the recommended action (0 or 1)
-               and explanation is a string explaining the decision.
+        int: The recommended action (0 or 1).
         """
-        if len(self_moves) == 0:
-            other_element = 0 if self.start_with else 1
+        if memory.rounds_played == 0:
+            if self.start_with_random:
+                memory.sequential = self.create_sequential(memory.rng.coin())
+            else:
+                memory.sequential = self.sequential
 
-            # Create the alternating sequence of actions
-            first_part = [self.start_with] * self.alternate_after
-            other_part = [other_element] * self.alternate_after
-            sequence = first_part + other_part
+        # Delegate the decision to the underlying Sequential strategy
+        return memory.sequential.get_action(self_moves, opponent_moves, memory)
 
-            # Initialize a Sequential strategy using the alternating sequence
-            self.sequential = Sequential(sequence=sequence)
+    def get_state_key(self, memory):
+        # Only called for a fixed start (deterministic), where every game has the same sequence
+        return memory.rounds_played % (2 * self.alternate_after)
 
-        # Delegate the decision to the underlying Sequential strategy
-        return self.sequential.get_recommended_action(self_moves, opponent_moves)
+    def new_vectorized_state(self, games):
+        # The starting action of every game
+        return np.empty(games, dtype=np.int8)
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        rounds_played = self_moves.shape[1]
+        if rounds_played == 0:
+            state[:] = _start_actions(self.start_with, len(self_moves), rng)
+
+        action_number = rounds_played % (2 * self.alternate_after)
+        return state if action_number < self.alternate_after else 1 - state
 
 
 class Pavlovian(Strategy):
@@ -310,6 +518,14 @@ class Pavlovian(Strategy):
     and switch if it led to a negative outcome for us as a whole
     (I cooperated but the opponent defected, or vice versa)"""
 
+    vectorized = True
+
+    thoughts = {
+        **_START_THOUGHTS,
+        'continue': "We did the same, so I continue",
+        'change': "We failed as a whole, so I change my action",
+    }
+
     def __init__(self, start_with):
         """
         Initialize the Pavlovian strategy.
@@ -326,36 +542,52 @@ class Pavlovian(Strategy):
 
         super().__init__('Pavlovian')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    @property
+    def deterministic(self):
+        return not self.start_with_random
+
+    def get_action(self, self_moves, opponent_moves, memory):
         """
         Get the recommended action based on Pavlovian logic.
 
         Parameters:
-        self_moves (list): List of the player's previous moves.
-        opponent_moves (list): List of the opponent's previous moves.
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
 
         Returns:
-        tuple: (action, explanation) where action is the recommended action (0 or 1)
-               and explanation is a string explaining the decision.
+        int: The recommended action (0 or 1).
         """
-        if len(self_moves) == 0:
+        if memory.rounds_played == 0:
             # If no previous moves, start with the specified action or randomly
-            thought = "I start randomly" if self.start_with_random else f"I start with a fixed action"
-            action = random.randint(0, 1) if self.start_with_random else self.start_with
-            return action, thought
+            return _start_action(self.start_with, memory)
 
-        my_last = self_moves[-1]
-        opponent_last = opponent_moves[-1]
+        my_last = memory.my_last_action
+        opponent_last = memory.opponent_last_action
 
         total_of_actions = my_last + opponent_last
 
         if total_of_actions == 0 or total_of_actions == 2:
             # If both actions are the same, continue with the same action
-            return my_last, "We did the same, so I continue"
+            memory.reason = 'continue'
+            return my_last
         else:
             # If actions led to a negative outcome, switch the action
-            flipped_action = 0 if my_last == 1 else 1
-            return flipped_action, "We failed as a whole, so I change my action"
+            memory.reason = 'change'
+            return 0 if my_last == 1 else 1
+
+    def get_state_key(self, memory):
+        return memory.rounds_played > 0, memory.my_last_action, memory.opponent_last_action
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        if self_moves.shape[1] == 0:
+            return _start_actions(self.start_with, len(self_moves), rng)
+
+        my_last = self_moves[:, -1]
+        opponent_last = opponent_moves[:, -1]
+
+        # Continue if we did the same, otherwise flip
+        return np.where(my_last == opponent_last, my_last, 1 - my_last).astype(np.int8)
 
 
 class Forgiver(Strategy):
@@ -370,6 +602,23 @@ class Forgiver(Strategy):
     I start with cooperating.
     """
 
+    class ForgiverMemory(Memory):
+        __slots__ = ('forgiveness_mode', 'forgiving_counter', 'cheating_counter')
+
+        def __init__(self, rng=None):
+            super().__init__(rng)
+            self.forgiveness_mode = False  # Flag to indicate if Forgiver is in forgiveness mode
+            self.forgiving_counter = 0  # Counter to track the number of forgiving actions while in forgiveness mode
+            self.cheating_counter = 0  # Counter to track the number of consecutive cheating actions
+
+    memory_class = ForgiverMemory
+
+    thoughts = {
+        'first': "I start by cooperating",
+        'forgiving': "I'm in a forgiving mood",
+        'forgive': "Let's forgive each other and start over",
+    }
+
     def __init__(self, grudge_limit, copy_kitten_limit, copy_kitten_start_with):
         """
         Initialize the Forgiver strategy.
@@ -384,118 +633,179 @@ class Forgiver(Strategy):
         # Initialize the CopyKitten strategy with the specified limit
         self.copy_kitten = CopyKitten(copy_kitten_limit, copy_kitten_start_with)
 
-        # Initialize forgiveness mode and counters
-        self.forgiveness_mode = False  # Flag to indicate if Forgiver is in forgiveness mode
-        self.forgiving_counter = 0  # Counter to track the number of forgiving actions while in forgiveness mode
+        # Initialize the limits, the mode and counters are kept in the memory of each game
         self.forgiveness_limit = copy_kitten_limit  # Number of actions to stay in forgiveness mode
-        self.cheating_counter = 0  # Counter to track the number of consecutive cheating actions
         self.cheating_limit = grudge_limit  # Number of consecutive cheating actions to trigger forgiveness mode
 
         super().__init__('Forgiver')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    @property
+    def deterministic(self):
+        return self.copy_kitten.deterministic
+
+    def get_action(self, self_moves, opponent_moves, memory):
         """
         Get the recommended action based on Forgiver logic.
 
         Parameters:
-        self_moves (list): List of the player's previous moves.
-        opponent_moves (list): List of the opponent's previous moves.
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
 
         Returns:
-        tuple: (action, explanation) where action is the recommended action (0 or 1)
-               and explanation is a string explaining the decision.
+        int: The recommended action (0 or 1).
         """
-        if len(self_moves) == 0:
-            return 1, "I start by cooperating"
+        if memory.rounds_played == 0:
+            memory.reason = 'first'
+            return 1
 
-        if self.forgiveness_mode:
-            if self.forgiving_counter >= self.forgiveness_limit:
+        if memory.forgiveness_mode:
+            if memory.forgiving_counter >= self.forgiveness_limit:
                 # Turn off forgiveness mode and reset counters
-                self.forgiveness_mode = False
-                self.forgiving_counter = 0
-                self.cheating_counter = 0
-                return self.get_recommended_action(self_moves, opponent_moves)
+                memory.forgiveness_mode = False
+                memory.forgiving_counter = 0
+                memory.cheating_counter = 0
+                return self.get_action(self_moves, opponent_moves, memory)
             else:
                 # Stay in forgiveness mode and cooperate
-                self.forgiving_counter += 1
-                return 1, "I'm in a forgiving mood"
+                memory.forgiving_counter += 1
+                memory.reason = 'forgiving'
+                return 1
         else:
-            kitty_action, kitty_thought = self.copy_kitten.get_recommended_action(self_moves, opponent_moves)
+            kitty_action = self.copy_kitten.get_action(self_moves, opponent_moves, memory)
             if kitty_action == 0:
-                if self.cheating_counter >= self.cheating_limit:
+                if memory.cheating_counter >= self.cheating_limit:
                     # Switch to forgiveness mode and cooperate
-                    self.forgiveness_mode = True
-                    self.cheating_counter = 0
-                    self.forgiving_counter = 1
-                    return 1, "Let's forgive each other and start over"
+                    memory.forgiveness_mode = True
+                    memory.cheating_counter = 0
+                    memory.forgiving_counter = 1
+                    memory.reason = 'forgive'
+                    return 1
+
+            # The reason is left by my kitty
+            return kitty_action
+
+    def get_state_key(self, memory):
+        return (memory.rounds_played > 0, memory.forgiveness_mode, memory.forgiving_counter,
+                memory.cheating_counter, self.copy_kitten.get_state_key(memory))
 
-            return kitty_action, f"My kitty: ({kitty_thought})"
+    def explain(self, memory):
+        if memory.reason in self.thoughts:
+            return super().explain(memory)
+        return f"My kitty: ({self.copy_kitten.explain(memory)})"
 
 
 class GenerousCopyKat(Strategy):
     """I start by cooperating and then copy my opponent's previous move, but forgive occasionally."""
 
+    vectorized = True
+
+    thoughts = {
+        'first': "I start by cooperating",
+        'forgive': "I forgive occasionally",
+        'copy': "I copy my opponent's last move",
+    }
+
     def __init__(self, forgiveness_prob=0.2):
         self.forgiveness_prob = forgiveness_prob
         super().__init__('GenerousCopyKat')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    def get_action(self, self_moves, opponent_moves, memory):
         """
         Get the recommended action based on the Generous CopyKat logic.
 
         Parameters:
-        self_moves (list): List of the player's previous moves.
-        opponent_moves (list): List of the opponent's previous moves.
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
 
         Returns:
-        tuple: (action, explanation) where action is the recommended action (0 or 1)
-               and explanation is a string explaining the decision.
+        int: The recommended action (0 or 1).
         """
-        if len(opponent_moves) == 0:
+        if memory.rounds_played == 0:
             # Start by cooperating
-            return 1, "I start by cooperating"
+            memory.reason = 'first'
+            return 1
         else:
             # Copy opponent's previous move, but forgive occasionally
-            last_opponent_move = opponent_moves[-1]
-            if random.random() < self.forgiveness_prob:
-                return 1, "I forgive occasionally"
-            return last_opponent_move, "I copy my opponent's last move"
+            if memory.rng.random() < self.forgiveness_prob:
+                memory.reason = 'forgive'
+                return 1
+            memory.reason = 'copy'
+            return memory.opponent_last_action
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        games = len(self_moves)
+        if opponent_moves.shape[1] == 0:
+            return np.ones(games, dtype=np.int8)
+        forgive = rng.random(games) < self.forgiveness_prob
+        return np.where(forgive, 1, opponent_moves[:, -1]).astype(np.int8)
 
 
 class SoftMajorityRule(Strategy):
     """I cooperate if my opponent has cooperated more than they've cheated, otherwise, I cheat."""
 
+    vectorized = True
+
+    thoughts = {
+        **_START_THOUGHTS,
+        'cooperate': "I cooperate if opponent has cooperated more",
+        'cheat': "I cheat if opponent has cheated more",
+    }
+
     def __init__(self, start_with):
         self.start_with_random = start_with is None
         self.start_with = start_with
 
         super().__init__('SoftMajorityRule')
 
-    def get_recommended_action(self, self_moves, opponent_moves):
+    @property
+    def deterministic(self):
+        return not self.start_with_random
+
+    def get_action(self, self_moves, opponent_moves, memory):
         """
         Get the recommended action based on the Soft Majority Rule logic.
 
         Parameters:
-        self_moves (list): List of the player's previous moves.
-        opponent_moves (list): List of the opponent's previous moves.
+        self_moves (memoryview): Read-only view of the player's previous moves.
+        opponent_moves (memoryview): Read-only view of the opponent's previous moves.
+        memory (Memory): The strategy's memory of the current game.
 
         Returns:
-        tuple: (action, explanation) where action is the recommended action (0 or 1)
-               and explanation is a string explaining the decision.
+        int: The recommended action (0 or 1).
         """
-        if len(self_moves) == 0:
+        if memory.rounds_played == 0:
             # If no previous moves, start with the specified action or randomly
-            thought = "I start randomly" if self.start_with_random else f"I start with a fixed action"
-            action = random.randint(0, 1) if self.start_with_random else self.start_with
-            return action, thought
+            return _start_action(self.start_with, memory)
 
-        num_cooperate = sum(opponent_moves)
-        num_cheat = len(opponent_moves) - num_cooperate
+        num_cooperate = memory.opponent_cooperations
+        num_cheat = memory.rounds_played - num_cooperate
 
         if num_cooperate > num_cheat:
-            return 1, "I cooperate if opponent has cooperated more"
+            memory.reason = 'cooperate'
+            return 1
         else:
-            return 0, "I cheat if opponent has cheated more"
+            memory.reason = 'cheat'
+            return 0
+
+    def get_state_key(self, memory):
+        # Only the difference between the opponent's cooperations and cheats matters
+        return memory.rounds_played > 0, 2 * memory.opponent_cooperations - memory.rounds_played
+
+    def new_vectorized_state(self, games):
+        # Running count of each opponent's cooperation
+        return np.zeros(games, dtype=np.int64)
+
+    def get_vectorized_actions(self, self_moves, opponent_moves, state, rng):
+        rounds_played = self_moves.shape[1]
+        if rounds_played == 0:
+            return _start_actions(self.start_with, len(self_moves), rng)
+
+        state += opponent_moves[:, -1]
+
+        # More cooperations than cheats
+        return (2 * state > rounds_played).astype(np.int8)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,265 @@
+from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from modules.tournament import Tournament
+from modules.strategies.strategies import *
+import numpy as np
+import hashlib
+import itertools
+import json
+import csv
+import os
+import time
+
+
+# Keys of a configuration that are not arguments of Tournament
+RUN_KEYS = ('strategies', 'generations', 'backend')
+
+
+def grid(**parameters):
+    """
+    Every combination of the given values.
+
+    Example: grid(rounds_per_game=[10, 100], mistake_chance=[0, 0.05]) gives 4 configurations.
+
+    Returns:
+    list: The configurations, as dicts.
+    """
+    names = list(parameters)
+    return [dict(zip(names, values)) for values in itertools.product(*parameters.values())]
+
+
+def random_configs(samples: int, seed: int = None, **parameters):
+    """
+    Random configurations.
+
+    Parameters:
+    samples (int): Number of configurations.
+    seed (int): Seed of the sampling.
+    parameters: For every parameter, a list to choose from, or a (low, high) tuple to sample uniformly
+                (integers when both are ints).
+
+    Returns:
+    list: The configurations, as dicts.
+    """
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(samples):
+        config = {}
+        for name, values in parameters.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    config[name] = int(rng.integers(low, high + 1))
+                else:
+                    config[name] = float(rng.uniform(low, high))
+            else:
+                config[name] = values[rng.integers(len(values))]
+        configs.append(config)
+    return configs
+
+
+def run_config(config: dict, strategies: List[Strategy], seed: int):
+    """
+    Run the generations of a single configuration (inside a worker process).
+
+    Parameters:
+    config (dict): Tournament arguments, with the generations and backend to run them with.
+    strategies (list): The strategies of the configuration's strategy set.
+    seed (int): Seed of the tournament.
+
+    Returns:
+    dict: The configuration, its seed, the run time and the final share of every strategy.
+    """
+    start = time.perf_counter()
+
+    tournament_arguments = {key: value for key, value in config.items() if key not in RUN_KEYS}
+    tournament = Tournament(strategies=strategies, seed=seed, **tournament_arguments)
+    tournament.run_generations(config.get('generations', 10), backend=config.get('backend', 'serial'))
+
+    counter = tournament.get_strategies_counter()
+    total = sum(counter.values())
+
+    row = dict(config)
+    row['seed'] = seed
+    row['seconds'] = time.perf_counter() - start
+    row['winner'] = max(counter, key=counter.get)
+    row['shares'] = {strategy: count / total for strategy, count in counter.items()}
+    return row
+
+
+class Sweep:
+    """Runs many tournament configurations in a pool of processes.
+
+    The result of every configuration is kept in a JSON file in the cache directory,
+    named by a hash of the configuration, so configurations that were already run are skipped."""
+
+    def __init__(self, strategy_sets: Dict[str, List[Strategy]],
+                 configs: List[dict],
+                 cache_directory: str,
+                 seed: int = 0,
+                 workers: int = None):
+        """
+        Initialize the sweep.
+
+        Parameters:
+        strategy_sets (dict): Name -> strategies, a configuration picks its set by name (its 'strategies' key).
+        configs (list): The configurations, e.g. from grid or random_configs. Besides 'strategies',
+                        'generations' and 'backend', their keys are arguments of Tournament.
+        cache_directory (str): Directory of the results, created if needed.
+        seed (int): Base seed, the seed of every run is derived from it and the run's configuration.
+        workers (int): Number of processes (None for all cores).
+
+        Returns:
+        None
+        """
+        for config in configs:
+            if config.get('strategies') not in strategy_sets:
+                raise ValueError(f'Unknown strategy set in {config}')
+
+        self.strategy_sets = strategy_sets
+        self.configs = configs
+        self.cache_directory = cache_directory
+        self.seed = seed
+        self.workers = workers
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def __repr__(self):
+        return f'Sweep [{len(self.configs)} configs, {self.cache_directory}]'
+
+    def get_key(self, config: dict):
+        """Hash of the configuration, including the strategies of its set and the base seed"""
+        description = dict(config,
+                           strategies=[str(strategy) for strategy in self.strategy_sets[config['strategies']]],
+                           base_seed=self.seed)
+        return hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def get_seed(self, key: str):
+        # The same configuration always gets the same seed, regardless of its position in the sweep
+        return int(np.random.SeedSequence([self.seed, int(key[:16], 16)]).generate_state(1)[0])
+
+    def get_cache_path(self, key: str):
+        return os.path.join(self.cache_directory, f'{key}.json')
+
+    def load_cached(self, key: str):
+        path = self.get_cache_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as file:
+            return json.load(file)
+
+    def save_cached(self, key: str, row: dict):
+        # Written aside and renamed, so an interrupted sweep never leaves a broken result
+        temporary_path = f'{self.get_cache_path(key)}.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump(row, file)
+        os.replace(temporary_path, self.get_cache_path(key))
+
+    def run(self):
+        """
+        Run the configurations that aren't cached yet.
+
+        Returns:
+        list: The result row of every configuration (see run_config), in the order of the configurations.
+        """
+        keys = [self.get_key(config) for config in self.configs]
+        rows = {key: self.load_cached(key) for key in keys}
+
+        missing = list(dict.fromkeys(key for key in keys if rows[key] is None))
+        if missing:
+            configs = {key: config for key, config in zip(keys, self.configs)}
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(run_config, configs[key],
+                                           self.strategy_sets[configs[key]['strategies']],
+                                           self.get_seed(key)): key
+                           for key in missing}
+
+                for future in as_completed(futures):
+                    key = futures[future]
+                    rows[key] = future.result()
+                    self.save_cached(key, rows[key])
+
+        return [rows[key] for key in keys]
+
+
+def flatten_row(row: dict):
+    """The row with a 'share <strategy>' column for every strategy"""
+    flat = {key: value for key, value in row.items() if key != 'shares'}
+    for strategy, share in row['shares'].items():
+        flat[f'share {strategy}'] = share
+    return flat
+
+
+def summary_table(rows: List[dict], columns: List[str] = None):
+    """
+    Format the results of a sweep as a text table.
+
+    Parameters:
+    rows (list): The rows returned by Sweep.run.
+    columns (list): Columns to show, all of them when None.
+
+    Returns:
+    str: The table.
+    """
+    flat_rows = [flatten_row(row) for row in rows]
+    if columns is None:
+        columns = list(dict.fromkeys(column for row in flat_rows for column in row))
+
+    def format_value(value):
+        if isinstance(value, float):
+            return f'{value:.3f}'
+        return '' if value is None else str(value)
+
+    cells = [[format_value(row.get(column)) for column in columns] for row in flat_rows]
+    widths = [max([len(column)] + [len(row[i]) for row in cells]) for i, column in enumerate(columns)]
+
+    lines = [[column.ljust(width) for column, width in zip(columns, widths)],
+             ['-' * width for width in widths]]
+    lines += [[cell.ljust(width) for cell, width in zip(row, widths)] for row in cells]
+    return '\n'.join('  '.join(line).rstrip() for line in lines)
+
+
+def write_csv(rows: List[dict], path: str):
+    flat_rows = [flatten_row(row) for row in rows]
+    columns = list(dict.fromkeys(column for row in flat_rows for column in row))
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(flat_rows)
+
+
+if __name__ == '__main__':
+    sweep_strategy_sets = {
+        'classic': [
+            GoodyTwoShoes(),
+            Cheater(),
+            CopyCat(start_with=1),
+            Grudger(defined_limit=1),
+            Pavlovian(start_with=1),
+        ],
+        'forgiving': [
+            Cheater(),
+            CopyKitten(defined_limit=2, start_with=1),
+            Forgiver(grudge_limit=2, copy_kitten_limit=2, copy_kitten_start_with=1),
+            GenerousCopyKat(forgiveness_prob=0.2),
+        ],
+    }
+
+    sweep_configs = grid(strategies=['classic', 'forgiving'],
+                         copies_of_each_strategy=[5],
+                         rounds_per_game=[20, 100],
+                         games_between_players=[1],
+                         initial_player_score=[100],
+                         top_percentage=[0.8],
+                         mistake_chance=[0, 0.05, 0.1],
+                         survival_bias=[0.1],
+                         generations=[5],
+                         backend=['vectorized'])
+
+    sweep = Sweep(strategy_sets=sweep_strategy_sets,
+                  configs=sweep_configs,
+                  cache_directory='sweep_results')
+
+    sweep_rows = sweep.run()
+    print(summary_table(sweep_rows, columns=['strategies', 'rounds_per_game', 'mistake_chance',
+                                             'winner', 'seconds']))
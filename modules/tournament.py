@@ -1,9 +1,65 @@
 from typing import List
-from _player import Player
-from _game import Game
-from strategies.strategies import *
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from modules._player import Player
+from modules._game import Game
+from modules._async_game import AsyncGame, is_async
+from modules._vectorized_game import VectorizedGames
+from modules._metrics import Metrics
+from modules._random_stream import RandomStream
+from modules._payoff import Payoff
+from modules._results_recorder import ResultsRecorder
+from modules._trace import TraceWriter
+from modules.strategies.strategies import *
+import numpy as np
+import asyncio
+import itertools
+import json
 import math
-from visuals.tournament_visualizer import *
+import os
+import time
+
+
+class MatchupCache:
+    """Least-recently-used cache of the results of games that can only end one way:
+    games between deterministic strategies without mistakes"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return f'MatchupCache [{len(self.results)}/{self.max_size}, hits: {self.hits}, misses: {self.misses}]'
+
+    @staticmethod
+    def is_cacheable(strategy_1: Strategy, strategy_2: Strategy, mistake_chance: float):
+        return mistake_chance == 0 and strategy_1.deterministic and strategy_2.deterministic
+
+    @staticmethod
+    def get_key(strategy_1: Strategy, strategy_2: Strategy, rounds: int, payoff: Payoff):
+        # A strategy's repr shows its whole configuration
+        return str(strategy_1), str(strategy_2), rounds, payoff.table_1
+
+    def get(self, key):
+        result = self.results.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+
+# Bumped whenever the content of the checkpoint files changes
+CHECKPOINT_VERSION = 1
 
 
 class Tournament:
@@ -15,6 +71,14 @@ class Tournament:
                  top_percentage: float,
                  mistake_chance: float,
                  survival_bias: float,
+                 self_play: bool = True,
+                 ordered_pairs: bool = True,
+                 seed: int = None,
+                 payoff=None,
+                 matchup_cache_size: int = 10000,
+                 metrics: Metrics = None,
+                 recorder: ResultsRecorder = None,
+                 trace: TraceWriter = None,
                  debug: bool = False):
 
         self.rounds_per_game = rounds_per_game
@@ -22,6 +86,20 @@ class Tournament:
         self.top_percentage = top_percentage  # the percentage of top players to be multiplied to the next round
         self.mistake_chance = mistake_chance
         self.survival_bias = survival_bias
+        self.strategies = strategies
+        self.self_play = self_play  # whether players also play against themselves
+        self.ordered_pairs = ordered_pairs  # whether each pair plays both as (a, b) and (b, a)
+        self.seed = seed
+        self.payoff = Payoff.from_config(payoff)  # A Payoff or its config (see Payoff.from_config)
+        self.rng = np.random.default_rng(seed)
+        self.random_stream = RandomStream(self.rng)  # Mistakes and random strategies of the serial games
+        self.matchup_cache = MatchupCache(matchup_cache_size) if matchup_cache_size else None
+        self.metrics = metrics
+        self.recorder = recorder
+        self.trace = trace  # Traced games are always played one by one, in this process
+        self.strategy_names = None  # Of every player, for the recorder
+        self.generation = 0
+        self.history = []  # The strategies counter before every generation
         self.debug = debug
 
         self.players = self.generate_players(strategies, copies_of_each_strategy, initial_player_score)
@@ -43,44 +121,450 @@ class Tournament:
         if self.debug:
             print(obj)
 
-    def setup_games(self):
-        games = []
-        games_counter = 1
-        for player_1 in self.players:
-            for player_2 in self.players:
-                player_1.reset()
-                player_2.reset()
-                for i in range(self.games_between_players):
-                    name_1 = player_1.name
-                    name_2 = player_2.name
-                    game_name = f'#{str(games_counter).zfill(3)} {name_1} vs. {name_2}'
-                    new_game = Game(player_1=player_1,
-                                    player_2=player_2,
-                                    name=game_name,
-                                    rounds=self.rounds_per_game)
-
-                    games.append(new_game)
-                    games_counter += 1
-        return games
-
-    def run(self):
-        games = self.setup_games()
-        for game in games:
-            game.run(mistake_chance=self.mistake_chance)
-
+    def iterate_pairings(self):
+        """Yield the indices of the two players of every game, games_between_players times per pair.
+
+        With ordered_pairs, both (a, b) and (b, a) are played, otherwise only one of them.
+        Without self_play, players don't play against themselves."""
+        players_count = len(self.players)
+        for index_1 in range(players_count):
+            first_opponent = 0 if self.ordered_pairs else index_1
+            for index_2 in range(first_opponent, players_count):
+                if index_1 == index_2 and not self.self_play:
+                    continue
+                for _ in range(self.games_between_players):
+                    yield index_1, index_2
+
+    def iterate_pairing_batches(self, batch_size: int):
+        """Yield the pairings as (firsts, seconds) index arrays of at most batch_size games"""
+        pairings = self.iterate_pairings()
+        while True:
+            batch = np.fromiter(itertools.chain.from_iterable(itertools.islice(pairings, batch_size)),
+                                dtype=np.int64)
+            if len(batch) == 0:
+                return
+            yield batch[0::2], batch[1::2]
+
+    def get_game_name(self, index_1: int, index_2: int, games_counter: int):
+        return f'#{str(games_counter).zfill(3)} {self.players[index_1].name} vs. {self.players[index_2].name}'
 
+    @staticmethod
+    def get_games_counter(game_name: str):
+        """The counter in a game's name (see get_game_name), None when the name has none"""
+        number = game_name.split(' ', 1)[0][1:]
+        return int(number) if game_name.startswith('#') and number.isdigit() else None
+
+    def create_game(self, index_1: int, index_2: int, games_counter: int):
+        return Game(player_1=self.players[index_1],
+                    player_2=self.players[index_2],
+                    name=self.get_game_name(index_1, index_2, games_counter),
+                    rounds=self.rounds_per_game,
+                    rng=self.random_stream,
+                    payoff=self.payoff,
+                    metrics=self.metrics,
+                    trace=self.trace)
+
+    def is_traced(self, index_1: int, index_2: int, games_counter: int):
+        return self.trace is not None and \
+            self.trace.wants_game(self.get_game_name(index_1, index_2, games_counter),
+                                  self.players[index_1].name, self.players[index_2].name)
+
+    def get_traced_games(self, firsts, seconds, games_before: int):
+        """
+        Mask of the games (of index arrays) that are traced.
+
+        Parameters:
+        firsts (np.ndarray): The first player of every game.
+        seconds (np.ndarray): The second player of every game.
+        games_before (int): Number of games of the tournament before these games.
+
+        Returns:
+        np.ndarray: A bool per game.
+        """
+        traced = np.zeros(len(firsts), dtype=bool)
+        if self.trace is None:
+            return traced
+
+        # Only the games that may be traced are checked one by one: the games whose counters are named
+        # by the games filter, or else the games of players that may be traced
+        if self.trace.games is not None:
+            traced_counters = [self.get_games_counter(name) for name in self.trace.games]
+            counters = np.arange(games_before + 1, games_before + len(firsts) + 1)
+            candidates = np.flatnonzero(np.isin(counters, [counter for counter in traced_counters
+                                                           if counter is not None]))
+        else:
+            may_be_traced = np.array([self.trace.may_want(player.name) for player in self.players], dtype=bool)
+            candidates = np.flatnonzero(may_be_traced[firsts] | may_be_traced[seconds])
+
+        traced[candidates] = [self.is_traced(firsts[i], seconds[i], games_before + i + 1) for i in candidates]
+        return traced
+
+    def play_game(self, index_1: int, index_2: int, games_counter: int):
+        """Play a single game, or reuse its cached result when it can only end one way"""
+        strategy_1 = self.players[index_1].strategy
+        strategy_2 = self.players[index_2].strategy
+
+        cacheable = self.matchup_cache is not None and not self.is_traced(index_1, index_2, games_counter) and \
+            not (self.players[index_1].keep_moves or self.players[index_2].keep_moves) and \
+            self.matchup_cache.is_cacheable(strategy_1, strategy_2, self.mistake_chance)
+
+        if cacheable:
+            key = self.matchup_cache.get_key(strategy_1, strategy_2, self.rounds_per_game, self.payoff)
+            start_time = time.perf_counter()
+            result = self.matchup_cache.get(key)
+            if result is not None:
+                # A game from the cache is still a game of the tournament
+                if self.metrics is not None:
+                    self.metrics.record_games(1, self.rounds_per_game, time.perf_counter() - start_time)
+                score_1, score_2 = result
+                self.players[index_1].update_score(score_1, 0)
+                self.players[index_2].update_score(score_2, 0)
+                self.record_game(index_1, index_2, result)
+                return
+
+        game = self.create_game(index_1, index_2, games_counter)
+        result = game.run(mistake_chance=self.mistake_chance)
+
+        if cacheable:
+            self.matchup_cache.put(key, result)
+
+        self.record_game(index_1, index_2, result)
+
+    def record_game(self, index_1: int, index_2: int, result):
+        if self.recorder is not None:
+            self.recorder.record_game(self.generation, index_1, index_2,
+                                      self.strategy_names[index_1], self.strategy_names[index_2], *result)
+
+    def record_games(self, firsts, seconds, scores_1, scores_2):
+        if self.recorder is not None:
+            self.recorder.record_games(self.generation, firsts, seconds,
+                                       self.strategy_names[firsts], self.strategy_names[seconds],
+                                       scores_1, scores_2)
+
+    def reset_players(self):
+        for player in self.players:
+            player.reset()
+
+    def run(self, backend: str = 'serial', batch_size: int = 50000,
+            workers: int = None, chunk_size: int = 1000, concurrency: int = 100, move_timeout: float = None):
+        """
+        Play all the games of the tournament.
+
+        Parameters:
+        backend (str): 'serial' plays the games one by one,
+                       'vectorized' plays the games of vectorized strategies in NumPy batches,
+                       'process' shards the games across a pool of processes,
+                       'async' interleaves the games of asynchronous strategies (see modules._async_game).
+                       Results of deterministic games are cached (except in the 'process' backend).
+                       Traced games are played one by one in every backend
+                       (or concurrently, as the other games of asynchronous strategies, in the 'async' backend).
+        batch_size (int): Maximal number of games in a vectorized batch.
+        workers (int): Number of processes for the 'process' backend (None for all cores).
+        chunk_size (int): Number of games sent to a process at once.
+        concurrency (int): Maximal number of games played at once by the 'async' backend.
+        move_timeout (float): Seconds an asynchronous strategy has for a decision in the 'async' backend
+                              (including waiting for a free process), after which it cheats (None for no limit).
+
+        Returns:
+        None
+        """
+        self.reset_players()
+
+        if self.recorder is not None:
+            self.strategy_names = np.array([str(player.strategy) for player in self.players])
+
+        if backend == 'serial':
+            for games_counter, (index_1, index_2) in enumerate(self.iterate_pairings(), start=1):
+                self.play_game(index_1, index_2, games_counter)
+        elif backend == 'vectorized':
+            self.run_vectorized(batch_size)
+        elif backend == 'process':
+            self.run_parallel(workers, chunk_size)
+        elif backend == 'async':
+            asyncio.run(self.run_async(concurrency, move_timeout))
+        else:
+            raise ValueError(f'Unknown backend "{backend}"')
+
+        if self.recorder is not None:
+            self.recorder.record_players(self.generation, self.players)
+
+    def run_parallel(self, workers: int, chunk_size: int):
+        strategies = [player.strategy for player in self.players]
+        score_changes = np.zeros(len(self.players), dtype=self.payoff.dtype)
+
+        # Keep a bounded number of chunks in flight, so the pairings are never all in memory
+        max_pending_chunks = 2 * (workers or os.cpu_count())
+        pending = deque()
+
+        # Number of games in the batches so far, to name the games played one by one as the serial backend does
+        games_before = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for firsts, seconds in self.iterate_pairing_batches(chunk_size):
+                traced_games = self.get_traced_games(firsts, seconds, games_before)
+                for position in np.flatnonzero(traced_games):
+                    self.play_game(firsts[position], seconds[position], games_before + position + 1)
+                games_before += len(firsts)
+                firsts = firsts[~traced_games]
+                seconds = seconds[~traced_games]
+                if len(firsts) == 0:
+                    continue
+
+                # Every chunk gets its own seed, so the results don't depend on which worker plays it
+                seed = int(self.rng.integers(2 ** 32))
+                pending.append((firsts, seconds,
+                                executor.submit(play_games_chunk, strategies, firsts, seconds,
+                                                self.rounds_per_game, self.mistake_chance, seed, self.payoff,
+                                                self.metrics is not None, self.recorder is not None)))
+
+                # Reduce in chunk order, regardless of which chunk finished first
+                if len(pending) >= max_pending_chunks:
+                    self.reduce_chunk(*pending.popleft(), score_changes)
+
+            while pending:
+                self.reduce_chunk(*pending.popleft(), score_changes)
+
+        for player, score_change in zip(self.players, score_changes):
+            player.score += score_change.item()
+
+    def reduce_chunk(self, firsts, seconds, future, score_changes):
+        chunk_score_changes, game_scores, chunk_metrics = future.result()
+        score_changes += chunk_score_changes
+        if chunk_metrics is not None:
+            self.metrics.merge(chunk_metrics)
+        if game_scores is not None:
+            self.record_games(firsts, seconds, *game_scores)
+
+    async def run_async(self, concurrency: int, move_timeout: float = None):
+        """Play the games between synchronous strategies one by one (as the 'serial' backend does), and then
+        the games of asynchronous strategies concurrently, so their move timeouts never wait for the other games"""
+        is_async_player = [is_async(player.strategy) for player in self.players]
+
+        for games_counter, (index_1, index_2) in enumerate(self.iterate_pairings(), start=1):
+            if not (is_async_player[index_1] or is_async_player[index_2]):
+                self.play_game(index_1, index_2, games_counter)
+
+        # Every strategy once, even when many players share it
+        async_strategies = list({id(player.strategy): player.strategy
+                                 for player, is_async_strategy in zip(self.players, is_async_player)
+                                 if is_async_strategy}.values())
+
+        semaphore = asyncio.Semaphore(concurrency)
+        # Only the games still playing are kept, with the errors of the games that failed
+        pending = set()
+        errors = []
+
+        def forget_game(task):
+            pending.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        async def play_async_game(index_1, index_2, games_counter, seed):
+            try:
+                player_1 = self.players[index_1]
+                player_2 = self.players[index_2]
+                game = AsyncGame(player_1=player_1,
+                                 player_2=player_2,
+                                 name=self.get_game_name(index_1, index_2, games_counter),
+                                 rounds=self.rounds_per_game,
+                                 rng=RandomStream.from_seed(seed),
+                                 payoff=self.payoff,
+                                 metrics=self.metrics,
+                                 trace=self.trace,
+                                 move_timeout=move_timeout)
+                result = await game.run(mistake_chance=self.mistake_chance)
+                self.record_game(index_1, index_2, result)
+            finally:
+                semaphore.release()
+
+        try:
+            # Started in the try, so the strategies started before one that fails are closed too
+            for strategy in async_strategies:
+                await strategy.start()
+
+            # The pairings are iterated again, so they are never all in memory
+            for games_counter, (index_1, index_2) in enumerate(self.iterate_pairings(), start=1):
+                if errors:
+                    break
+                if is_async_player[index_1] or is_async_player[index_2]:
+                    # Every game gets its own stream, so the results don't depend on the order the games finish in
+                    seed = int(self.rng.integers(2 ** 32))
+                    await semaphore.acquire()
+                    task = asyncio.ensure_future(play_async_game(index_1, index_2, games_counter, seed))
+                    pending.add(task)
+                    task.add_done_callback(forget_game)
+
+            await asyncio.gather(*pending)
+            if errors:
+                raise errors[0]
+        finally:
+            # Games still playing (after an error) are stopped before their strategies are closed
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+            # Processes of strategies belong to this event loop, so they are closed with it
+            for strategy in async_strategies:
+                await strategy.close()
+
+    def run_vectorized(self, batch_size: int):
+        is_vectorized = np.array([player.strategy.vectorized and not player.keep_moves for player in self.players],
+                                 dtype=bool)
+        score_changes = np.zeros(len(self.players), dtype=self.payoff.dtype)
+
+        # Number of games in the batches so far, to name the games played one by one as the serial backend does
+        games_before = 0
+
+        for firsts, seconds in self.iterate_pairing_batches(batch_size):
+            vectorized_games = is_vectorized[firsts] & is_vectorized[seconds] & \
+                ~self.get_traced_games(firsts, seconds, games_before)
+
+            # Games with a strategy that can't be vectorized (or traced games) are played one by one
+            for position in np.flatnonzero(~vectorized_games):
+                self.play_game(firsts[position], seconds[position], games_before + position + 1)
+            games_before += len(firsts)
+
+            firsts = firsts[vectorized_games]
+            seconds = seconds[vectorized_games]
+            if len(firsts) == 0:
+                continue
+
+            games = VectorizedGames(strategies_1=[self.players[i].strategy for i in firsts],
+                                    strategies_2=[self.players[i].strategy for i in seconds],
+                                    rounds=self.rounds_per_game,
+                                    rng=self.rng,
+                                    payoff=self.payoff,
+                                    metrics=self.metrics)
+            scores_1, scores_2 = games.run(mistake_chance=self.mistake_chance)
+
+            np.add.at(score_changes, firsts, scores_1)
+            np.add.at(score_changes, seconds, scores_2)
+
+            self.record_games(firsts, seconds, scores_1, scores_2)
+
+        for player, score_change in zip(self.players, score_changes):
+            player.score += score_change.item()
+
+    def run_generation(self, **run_options):
+        """Play a tournament and replace the players by the multiplied top players.
+        The run options are passed to run."""
+        self.history.append(self.get_strategies_counter())
+
+        metrics = self.metrics if self.metrics is not None else Metrics()
+        with metrics.measure_generation():
+            self.run(**run_options)
+            self.sort_players()
+            self.multiply_top_players()
+        self.generation += 1
+
+    def run_generations(self, generations: int, checkpoint_path: str = None, checkpoint_every: int = 10,
+                        **run_options):
+        """
+        Run generations until the given generation, optionally with checkpoints.
+
+        Parameters:
+        generations (int): The generation to stop at (the total number of generations).
+        checkpoint_path (str): File of the checkpoint. When it exists, the run resumes from it.
+        checkpoint_every (int): Number of generations between checkpoints.
+        run_options: Passed to run.
+
+        Returns:
+        None
+        """
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            self.load_checkpoint(checkpoint_path)
+
+        while self.generation < generations:
+            self.run_generation(**run_options)
+
+            if checkpoint_path is not None and \
+                    (self.generation % checkpoint_every == 0 or self.generation == generations):
+                self.save_checkpoint(checkpoint_path)
+
+    def save_checkpoint(self, path: str):
+        """
+        Save the players, generation, history and random states to a .npz file.
+
+        Only the composition of the population is saved (as indices into the tournament's strategies),
+        so it has to be loaded by a tournament created with the same strategies.
+
+        Parameters:
+        path (str): The checkpoint file, replaced atomically so a crash never leaves half a checkpoint.
+
+        Returns:
+        None
+        """
+        strategy_indices = {id(strategy): index for index, strategy in enumerate(self.strategies)}
+        strategy_names = [str(strategy) for strategy in self.strategies]
+
+        history_names = sorted({name for counter in self.history for name in counter})
+        history = np.array([[counter.get(name, 0) for name in history_names] for counter in self.history],
+                           dtype=np.int64).reshape(len(self.history), len(history_names))
+
+        stream_state, stream_values = self.random_stream.get_state()
+
+        metadata = {
+            'version': CHECKPOINT_VERSION,
+            'generation': self.generation,
+            'strategies': strategy_names,
+            'history_strategies': history_names,
+            'rng_state': self.rng.bit_generator.state,
+            'stream_state': stream_state,
+        }
+
+        temporary_path = f'{path}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.savez(file,
+                     metadata=np.array(json.dumps(metadata)),
+                     player_strategies=np.array([strategy_indices[id(player.strategy)] for player in self.players],
+                                                dtype=np.int32),
+                     player_names=np.array([player.name for player in self.players]),
+                     player_scores=np.array([player.score for player in self.players], dtype=self.payoff.dtype),
+                     player_initial_scores=np.array([player.initial_score for player in self.players],
+                                                    dtype=np.int64),
+                     history=history,
+                     stream_values=stream_values)
+        os.replace(temporary_path, path)
+
+    def load_checkpoint(self, path: str):
+        """Restore the state saved by save_checkpoint, see there"""
+        with np.load(path, allow_pickle=False) as checkpoint:
+            metadata = json.loads(str(checkpoint['metadata']))
+
+            if metadata['version'] != CHECKPOINT_VERSION:
+                raise ValueError(f'Unsupported checkpoint version {metadata["version"]}')
+            if metadata['strategies'] != [str(strategy) for strategy in self.strategies]:
+                raise ValueError('The checkpoint was saved by a tournament with other strategies')
+
+            self.players = [Player(name=str(name),
+                                   strategy=self.strategies[strategy_index],
+                                   initial_score=int(initial_score))
+                            for strategy_index, name, initial_score in zip(checkpoint['player_strategies'],
+                                                                           checkpoint['player_names'],
+                                                                           checkpoint['player_initial_scores'])]
+            for player, score in zip(self.players, checkpoint['player_scores']):
+                player.score = score.item()
+            self.total_players = len(self.players)
+
+            history_names = metadata['history_strategies']
+            self.history = [{name: int(count) for name, count in zip(history_names, counts) if count > 0}
+                            for counts in checkpoint['history']]
+
+            self.generation = metadata['generation']
+            self.rng.bit_generator.state = metadata['rng_state']
+            self.random_stream.set_state(metadata['stream_state'], checkpoint['stream_values'])
 
     def sort_players(self):
         self.players.sort(key=lambda player: float(player.score), reverse=True)
 
 
     def sort_players2(self):
-        random_indices = self.get_random_indices(range(len(self.players)),
+        random_indices = self.get_random_indices(list(range(len(self.players))), self.rng,
                                                  reverse=True, randomness=self.survival_bias)
 
     @staticmethod
-    def get_random_indices(original_array, reverse=False, randomness=0.0):
-        array = copy.copy(original_array)
+    def get_random_indices(original_array, rng: np.random.Generator, reverse=False, randomness=0.0):
+        array = list(original_array)
 
         # Sort the array in the specified order
         array.sort(reverse=reverse)
@@ -91,14 +575,14 @@ class Tournament:
         num_elements_to_shuffle = int(randomness * array_length)
 
         # Generate indices of elements to be shuffled
-        shuffled_indices = random.sample(range(array_length), num_elements_to_shuffle)
+        shuffled_indices = rng.choice(array_length, num_elements_to_shuffle, replace=False)
 
         sublist = []
 
         for i in shuffled_indices:
             sublist.append(array[i])
 
-        np.random.shuffle(sublist)
+        sublist = [sublist[i] for i in rng.permutation(len(sublist))]
 
         for i, index in enumerate(shuffled_indices):
             array[index] = sublist[i]
@@ -135,9 +619,9 @@ class Tournament:
         for player in players:
             score_groups.setdefault(player.score, []).append(player)
 
-        # Shuffle the players within each score group
+        # Shuffle the players within each score group, with the tournament's generator so seeded runs repeat
         for score_group in score_groups.values():
-            random.shuffle(score_group)
+            score_group[:] = [score_group[i] for i in self.rng.permutation(len(score_group))]
 
         # Flatten the list to get the final mixed order of players
         mixed_players = [player for score_group in score_groups.values() for player in score_group]
@@ -161,6 +645,56 @@ class Tournament:
         return strategies_counter
 
 
+def visualize(components, text_to_display):
+    """Plot the composition of the generations (see visuals.tournament_visualizer).
+    pandas and matplotlib are only imported here, so headless runs never load them."""
+    from visuals.tournament_visualizer import visualize as visualize_components
+    visualize_components(components, text_to_display)
+
+
+def play_games_chunk(strategies, firsts, seconds, rounds, mistake_chance, seed, payoff=None,
+                     collect_metrics=False, collect_game_scores=False):
+    """
+    Play a chunk of a tournament's games inside a worker process.
+
+    Parameters:
+    strategies (list): The strategy of every player of the tournament.
+    firsts (np.ndarray): Index of the first player of every game.
+    seconds (np.ndarray): Index of the second player of every game.
+    rounds (int): Number of rounds in every game.
+    mistake_chance (float): Probability of every single action being flipped.
+    seed (int): Seed of the random generator for this chunk.
+    payoff (Payoff): The scores of a round, the default donation game when None.
+    collect_metrics (bool): Whether to record metrics of the games.
+    collect_game_scores (bool): Whether to return the scores of every game.
+
+    Returns:
+    tuple: (score_changes, game_scores, metrics) the score change of every player of the tournament,
+           a (2, games) array of the score changes in every game and the Metrics of the chunk
+           (None when not collected).
+    """
+    rng = RandomStream.from_seed(seed)
+    metrics = Metrics() if collect_metrics else None
+
+    payoff = Payoff.from_config(payoff)
+    players = [Player(name=str(i), strategy=strategy, initial_score=0) for i, strategy in enumerate(strategies)]
+    game_scores = np.empty((2, len(firsts)), dtype=payoff.dtype) if collect_game_scores else None
+
+    for game_index, (first, second) in enumerate(zip(firsts, seconds)):
+        game = Game(player_1=players[first],
+                    player_2=players[second],
+                    name=f'{first} vs. {second}',
+                    rounds=rounds,
+                    rng=rng,
+                    payoff=payoff,
+                    metrics=metrics)
+        result = game.run(mistake_chance=mistake_chance)
+        if game_scores is not None:
+            game_scores[:, game_index] = result
+
+    return np.array([player.score for player in players], dtype=payoff.dtype), game_scores, metrics
+
+
 if __name__ == '__main__':
     tournament_strategies = [
         GoodyTwoShoes(),
@@ -190,25 +724,21 @@ if __name__ == '__main__':
 
     generations = 5
 
-    strategies_components = []
-
     names = [str(strategy) for strategy in tournament_strategies]
     for generation in range(generations):
         d = tournament.get_strategies_counter()
         new_d = {name: str(d.get(name, 0)).zfill(3) for name in names}
-        strategies_components.append(d)
         print(f'\nBefore tournament #{generation + 1} ({len(tournament.players)} players):\n{d}\n')
 
-        tournament.run()
-        tournament.sort_players()
-
-        tournament.multiply_top_players()
+        tournament.run_generation()
 
     d = tournament.get_strategies_counter()
     new_d = {name: str(d.get(name, 0)).zfill(3) for name in names}
-    strategies_components.append(d)
+    strategies_components = tournament.history + [d]
     print(f'\nAfter all tournaments:\n{d}\n')
 
-    d = {key: value for key, value in tournament.__dict__.items() if key not in ['players', 'debug']}
+    not_parameters = ['players', 'strategies', 'history', 'rng', 'random_stream', 'matchup_cache',
+                      'metrics', 'recorder', 'trace', 'strategy_names', 'debug']
+    d = {key: value for key, value in tournament.__dict__.items() if key not in not_parameters}
 
     visualize(strategies_components, d)
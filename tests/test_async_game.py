@@ -0,0 +1,40 @@
+from modules._async_game import AsyncGame, DelayedStrategy
+from modules._player import Player
+from modules._random_stream import RandomStream
+from modules._trace import TraceWriter, read_trace
+from modules.tournament import Tournament
+from modules.strategies.strategies import *
+import asyncio
+
+
+def test_async_games_are_traced_with_thoughts(tmp_path):
+    path = str(tmp_path / 'trace.jsonl')
+    with TraceWriter(path, players=['CopyCat #0']) as trace:
+        tournament = Tournament(strategies=[DelayedStrategy(CopyCat(start_with=1), 0), Cheater()],
+                                copies_of_each_strategy=2, rounds_per_game=10, games_between_players=1,
+                                initial_player_score=0, top_percentage=1, mistake_chance=0.1,
+                                survival_bias=0, seed=0, trace=trace)
+        tournament.run(backend='async')
+
+    events = list(read_trace(path))
+    games = [event for event in events if event['event'] == 'game']
+    assert games and all('CopyCat #0' in (game['player_1'], game['player_2']) for game in games)
+
+    # Every game's events are together, the game first and then its rounds
+    for game in games:
+        start = events.index(game)
+        rounds = events[start + 1:start + 1 + game['rounds']]
+        assert [event['round'] for event in rounds] == list(range(game['rounds']))
+        assert all(event['thoughts_1'] and event['thoughts_2'] for event in rounds)
+
+
+def test_async_games_fill_kept_moves():
+    for strategy_2 in (Joker(threshold_to_cooperate=0.5), DelayedStrategy(Cheater(), 0)):
+        game = AsyncGame(player_1=Player(name='1', strategy=DelayedStrategy(CopyCat(start_with=1), 0),
+                                         initial_score=0, keep_moves=True),
+                         player_2=Player(name='2', strategy=strategy_2, initial_score=0, keep_moves=True),
+                         name='test', rounds=20, rng=RandomStream.from_seed(0))
+        asyncio.run(game.run(mistake_chance=0))
+
+        assert game.player_1.moves == list(game.moves_1)
+        assert game.player_2.moves == list(game.moves_2)
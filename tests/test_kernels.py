@@ -0,0 +1,72 @@
+from modules._game import Game
+from modules._kernels import verify
+from modules._player import Player
+from modules._random_stream import RandomStream
+from modules.tournament import Tournament
+from modules.strategies.strategies import *
+import pytest
+
+
+DETERMINISTIC_STRATEGIES = [
+    GoodyTwoShoes(),
+    Cheater(),
+    CopyCat(start_with=1),
+    CopyKitten(defined_limit=2, start_with=1),
+    Grudger(defined_limit=3),
+    Sequential(sequence=[1, 0, 0, 1, 1, 0]),
+    Alternator(alternate_after=2, start_with=1),
+    Pavlovian(start_with=1),
+    Forgiver(grudge_limit=3, copy_kitten_limit=2, copy_kitten_start_with=1),
+    SoftMajorityRule(start_with=1),
+]
+
+
+def play(strategy_1, strategy_2, seed=0, mistake_chance=0.0, keep_moves=False, **game_options):
+    game = Game(player_1=Player(name='1', strategy=strategy_1, initial_score=0, keep_moves=keep_moves),
+                player_2=Player(name='2', strategy=strategy_2, initial_score=0, keep_moves=keep_moves),
+                name='test', rounds=100, rng=RandomStream.from_seed(seed), **game_options)
+    scores = game.run(mistake_chance=mistake_chance)
+    return game, scores
+
+
+def test_kernels_play_as_the_generic_loop():
+    assert verify() == []
+
+
+@pytest.mark.parametrize('strategy_1', DETERMINISTIC_STRATEGIES, ids=str)
+def test_skipped_cycles_play_as_all_the_rounds(strategy_1):
+    for strategy_2 in DETERMINISTIC_STRATEGIES:
+        skipped, skipped_scores = play(strategy_1, strategy_2, use_kernels=False, detect_cycles=True)
+        played, played_scores = play(strategy_1, strategy_2, use_kernels=False, detect_cycles=False)
+
+        assert skipped_scores == played_scores
+        assert skipped.moves_1 == played.moves_1
+        assert skipped.moves_2 == played.moves_2
+
+
+def test_vectorized_games_score_as_serial_games():
+    # Without mistakes every game can only end one way, so the backends must agree exactly
+    vectorized_strategies = [strategy for strategy in DETERMINISTIC_STRATEGIES if strategy.vectorized]
+    scores = {}
+    for backend in ('serial', 'vectorized'):
+        tournament = Tournament(strategies=vectorized_strategies, copies_of_each_strategy=2, rounds_per_game=50,
+                                games_between_players=1, initial_player_score=0, top_percentage=1,
+                                mistake_chance=0, survival_bias=0, seed=0, matchup_cache_size=0)
+        tournament.run(backend=backend)
+        scores[backend] = [player.score for player in tournament.players]
+
+    assert scores['serial'] == scores['vectorized']
+
+
+@pytest.mark.parametrize('mistake_chance', [0.0, 0.1])
+def test_kept_moves_are_complete(mistake_chance):
+    # Kernels (and skipped cycles) don't ask the players, so they fill in the moves the players keep
+    for strategy_1, strategy_2 in [(CopyCat(start_with=1), GenerousCopyKat(forgiveness_prob=0.2)),
+                                   (CopyKitten(defined_limit=2, start_with=1), Alternator(alternate_after=2, start_with=1))]:
+        fast, _ = play(strategy_1, strategy_2, mistake_chance=mistake_chance, keep_moves=True)
+        slow, _ = play(strategy_1, strategy_2, mistake_chance=mistake_chance, keep_moves=True,
+                       use_kernels=False, detect_cycles=False)
+
+        assert len(fast.player_1.moves) == fast.rounds
+        assert fast.player_1.moves == slow.player_1.moves
+        assert fast.player_2.moves == slow.player_2.moves
@@ -0,0 +1,39 @@
+from modules._trace import TraceWriter, read_trace
+from modules.tournament import Tournament
+from modules.strategies.strategies import *
+
+
+def create_tournament(trace: TraceWriter, mistake_chance: float):
+    return Tournament(strategies=[GoodyTwoShoes(), Cheater(), CopyCat(start_with=1), Grudger(defined_limit=3)],
+                      copies_of_each_strategy=3, rounds_per_game=20, games_between_players=1,
+                      initial_player_score=0, top_percentage=1, mistake_chance=mistake_chance,
+                      survival_bias=0, seed=0, trace=trace)
+
+
+def get_traced_names(path):
+    return [event['game'] for event in read_trace(path) if event['event'] == 'game']
+
+
+def test_games_filter_only_plays_the_named_games_one_by_one(tmp_path, monkeypatch):
+    path = str(tmp_path / 'trace.jsonl')
+    with TraceWriter(path, games=['#005 GoodyTwoShoes #0 vs. Cheater #1']) as trace:
+        tournament = create_tournament(trace, mistake_chance=0.05)
+
+        played_one_by_one = []
+        play_game = tournament.play_game
+        monkeypatch.setattr(tournament, 'play_game',
+                            lambda *game: played_one_by_one.append(game) or play_game(*game))
+        tournament.run(backend='vectorized', batch_size=7)
+
+    assert len(played_one_by_one) == 1
+    assert get_traced_names(path) == ['#005 GoodyTwoShoes #0 vs. Cheater #1']
+
+
+def test_games_filter_keeps_caching_the_other_games(tmp_path):
+    path = str(tmp_path / 'trace.jsonl')
+    with TraceWriter(path, games=['#005 GoodyTwoShoes #0 vs. Cheater #1']) as trace:
+        tournament = create_tournament(trace, mistake_chance=0)
+        tournament.run(backend='serial')
+
+    assert tournament.matchup_cache.hits > 0
+    assert get_traced_names(path) == ['#005 GoodyTwoShoes #0 vs. Cheater #1']